@@ -1,10 +1,22 @@
 """byLLM Package."""
 
-from byllm.llm import MockLLM, Model
+from byllm.cache import ResponseCache
+from byllm.llm import MockLLM, Model, abatch, batch
 from byllm.mtir import MTIR
 from byllm.plugin import JacRuntime
 from byllm.types import Image, MockToolCall, Video
 
 by = JacRuntime.by
 
-__all__ = ["by", "Image", "MockLLM", "MockToolCall", "Model", "MTIR", "Video"]
+__all__ = [
+    "abatch",
+    "batch",
+    "by",
+    "Image",
+    "MockLLM",
+    "MockToolCall",
+    "Model",
+    "MTIR",
+    "ResponseCache",
+    "Video",
+]
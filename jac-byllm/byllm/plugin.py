@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import inspect
 from collections.abc import Callable
 from typing import TYPE_CHECKING
 
@@ -29,13 +30,19 @@ class JacRuntime:
         """Call JacLLM and return the result."""
         return model.invoke(mtir=mtir)
 
+    @staticmethod
+    @hookimpl
+    async def acall_llm(model: Model, mtir: MTIR) -> object:
+        """Call JacLLM from async code and return the result."""
+        return await model.ainvoke(mtir=mtir)
+
     @staticmethod
     @hookimpl
     def by(model: Model) -> Callable:
         """Python library mode decorator for Jac's by llm() syntax."""
 
         def _decorator(caller: Callable) -> Callable:
-            def _wrapped_caller(*args: object, **kwargs: object) -> object:
+            def _get_mtir(args: tuple, kwargs: dict[str, object]) -> MTIR:
                 from byllm.mtir import MTIR
 
                 invoke_args: dict[int | str, object] = {}
@@ -43,12 +50,23 @@ class JacRuntime:
                     invoke_args[i] = arg
                 for key, value in kwargs.items():
                     invoke_args[key] = value
-                mtir = MTIR.factory(
+                return MTIR.factory(
                     caller=caller,
                     args=invoke_args,
                     call_params=model.call_params,
                 )
-                return model.invoke(mtir=mtir)
+
+            if inspect.iscoroutinefunction(caller):
+
+                async def _async_wrapped_caller(
+                    *args: object, **kwargs: object
+                ) -> object:
+                    return await model.ainvoke(mtir=_get_mtir(args, kwargs))
+
+                return _async_wrapped_caller
+
+            def _wrapped_caller(*args: object, **kwargs: object) -> object:
+                return model.invoke(mtir=_get_mtir(args, kwargs))
 
             return _wrapped_caller
 
@@ -1,6 +1,7 @@
 """Tests for Integration with Jaclang."""
 
 import io
+import os
 import sys
 
 import yaml
@@ -324,3 +325,160 @@ class JacLanguageTests(TestCase):
         ]
         for label in expected_labels:
             self.assertIn(label, stdout_value)
+
+    def test_response_cache(self) -> None:
+        """Test identical calls are served from the response cache."""
+        captured_output = io.StringIO()
+        sys.stdout = captured_output
+        jac_import("llm_response_cache", base_path=self.fixture_abs_path("./"))
+        sys.stdout = sys.__stdout__
+        stdout_value = captured_output.getvalue()
+        self.assertEqual(stdout_value.split("\n")[:4], ["42", "42", "42", "calls: 2"])
+
+    def test_response_cache_disk_tier(self) -> None:
+        """Test cached replies persist on disk and expire after the TTL."""
+        import tempfile
+        import time
+
+        from byllm.lib import ResponseCache
+
+        params = {"model": "gpt-4o", "messages": [{"role": "user", "content": "hi"}]}
+        key = ResponseCache.make_key(params)
+        self.assertEqual(key, ResponseCache.make_key({**params, "api_key": "secret"}))
+        self.assertNotEqual(key, ResponseCache.make_key({**params, "model": "gpt-5"}))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = f"{tmp}/cache.db"
+            cache = ResponseCache(path=path, max_entries=1, ttl=60)
+            cache.set(key, {"role": "assistant", "content": "hello"})
+            cache.set("other", {"role": "assistant", "content": "bye"})
+            # Evicted from memory, reloaded from disk.
+            self.assertEqual(cache.get(key), {"role": "assistant", "content": "hello"})
+            cache.close()
+
+            reopened = ResponseCache(path=path, ttl=0.01)
+            time.sleep(0.05)
+            self.assertIsNone(reopened.get(key))
+            reopened.close()
+
+    def test_parallel_tool_calls(self) -> None:
+        """Test tool calls of one turn run concurrently and keep their order."""
+        captured_output = io.StringIO()
+        sys.stdout = captured_output
+        jac_import("parallel_tool_calls", base_path=self.fixture_abs_path("./"))
+        sys.stdout = sys.__stdout__
+        stdout_value = captured_output.getvalue()
+        self.assertEqual(
+            stdout_value.split("\n")[:3],
+            ["Sunny in both cities.", "Colombo: sunny", "Kandy: sunny"],
+        )
+
+    def test_async_by_llm_batch(self) -> None:
+        """Test async by llm() abilities and batched calls run concurrently."""
+        captured_output = io.StringIO()
+        sys.stdout = captured_output
+        jac_import("async_by_llm", base_path=self.fixture_abs_path("./"))
+        sys.stdout = sys.__stdout__
+        stdout_value = captured_output.getvalue()
+        self.assertEqual(
+            stdout_value.split("\n")[:3],
+            ["['ALICE', 'BOB', 'CAROL']", "peak: 2", "['DAVE', 'ERIN']"],
+        )
+
+    def test_call_plan_cache(self) -> None:
+        """Test schemas and tools are built once per callable and type."""
+        from dataclasses import dataclass
+
+        from byllm.lib import MTIR
+
+        @dataclass
+        class Person:
+            name: str
+            age: int
+
+        def lookup(name: str) -> str:
+            return name
+
+        def find_person(name: str) -> Person:
+            raise NotImplementedError
+
+        class Greeter:
+            def greet(self, name: str) -> str:
+                raise NotImplementedError
+
+        first = MTIR.factory(find_person, {0: "Ada"}, {"tools": [lookup]})
+        second = MTIR.factory(find_person, {0: "Alan"}, {"tools": [lookup]})
+        self.assertEqual(
+            [tool.get_name() for tool in second.tools], ["lookup", "finish_tool"]
+        )
+        for tool_a, tool_b in zip(first.tools, second.tools, strict=True):
+            self.assertIs(tool_a, tool_b)
+        for schema_a, schema_b in zip(
+            first.get_tool_list(), second.get_tool_list(), strict=True
+        ):
+            self.assertIs(schema_a, schema_b)
+        self.assertIn("name = Ada", str(first.get_msg_list()[1]["content"]))
+        self.assertIn("name = Alan", str(second.get_msg_list()[1]["content"]))
+
+        plain = MTIR.factory(find_person, {"name": "Ada"}, {})
+        self.assertIs(
+            plain.get_output_schema(),
+            MTIR.factory(find_person, {"name": "Alan"}, {}).get_output_schema(),
+        )
+
+        # Bound methods share the plan of their function but skip `self`.
+        greeter = Greeter()
+        method = MTIR.factory(greeter.greet, {0: "Ada"}, {})
+        self.assertIn("name = Ada", str(method.get_msg_list()[1]["content"]))
+        self.assertIs(method.resp_type, str)
+
+    def test_video_frame_sampler(self) -> None:
+        """Test video frames are sampled within budget and cached within limits."""
+        import tempfile
+
+        try:
+            import cv2
+            import numpy as np
+        except ImportError:
+            self.skipTest("This test requires OpenCV to be installed.")
+
+        from byllm.lib import Video
+
+        path = self.fixture_abs_path("SampleVideo_1280x720_2mb.mp4")
+        self.assertEqual(len(list(Video(path=path, cache_dir=None).iter_frames())), 14)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            video = Video(path=path, max_size=320, max_frames=3, cache_dir=tmp)
+            frames = video.to_dict()
+            self.assertEqual(len(frames), 3)
+            self.assertTrue(frames[0]["image_url"].startswith("data:image/jpeg;base64"))
+            self.assertEqual(os.listdir(tmp), [video.cache_key()])
+
+            frame = cv2.imdecode(
+                np.frombuffer(next(video.iter_frames()), np.uint8), cv2.IMREAD_COLOR
+            )
+            self.assertEqual(frame.shape[:2], (180, 320))
+            self.assertEqual(video.to_dict(), frames)
+
+            # The least recently used video is evicted once the cache is full.
+            size = sum(
+                os.path.getsize(os.path.join(tmp, video.cache_key(), f))
+                for f in os.listdir(os.path.join(tmp, video.cache_key()))
+            )
+            other = Video(
+                path=path,
+                max_size=320,
+                max_frames=2,
+                cache_dir=tmp,
+                cache_max_bytes=size,
+            )
+            other.to_dict()
+            self.assertEqual(os.listdir(tmp), [other.cache_key()])
+
+            first_size = len(next(video.iter_frames()))
+            budget = Video(
+                path=path, max_size=320, max_bytes=first_size * 2, cache_dir=None
+            )
+            sizes = [len(frame) for frame in budget.iter_frames()]
+            self.assertGreaterEqual(len(sizes), 1)
+            self.assertLessEqual(sum(sizes), first_size * 2)
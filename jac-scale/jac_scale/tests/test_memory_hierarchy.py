@@ -0,0 +1,216 @@
+"""Tests for the write-behind queue of the persistent tiers."""
+
+import multiprocessing
+import os
+import pickle
+import sys
+from collections.abc import Callable, Sequence
+from multiprocessing.queues import Queue
+from multiprocessing.synchronize import Event as ProcessEvent
+from threading import Event, Thread
+from uuid import UUID
+
+import pytest
+
+from jaclang.runtimelib.archetype import Anchor, Root
+from jaclang.runtimelib.memory import Memory
+
+from ..memory_hierarchy import (
+    SHELF_INDEX_VERSION_KEY,
+    PendingWrite,
+    ShelfDB,
+    WriteBehind,
+)
+
+
+@pytest.fixture
+def shelf(tmp_path):
+    """Shelf store in a temporary directory."""
+    store = ShelfDB(shelf_path=str(tmp_path / "anchors.db"))
+    yield store
+    store.close()
+
+
+def gate(shelf: ShelfDB) -> tuple[Event, Event, list[list[str]]]:
+    """Hold the writes applied to the shelf until the release event is set."""
+    applying, release = Event(), Event()
+    batches: list[list[str]] = []
+    apply_writes: Callable[[Sequence[PendingWrite]], None] = shelf.apply_writes
+
+    def gated(writes: Sequence[PendingWrite]) -> None:
+        applying.set()
+        release.wait()
+        batches.append([write.id for write in writes])
+        apply_writes(writes)
+
+    shelf.apply_writes = gated  # type: ignore[method-assign]
+    return applying, release, batches
+
+
+def fail(shelf: ShelfDB) -> None:
+    """Make every write applied to the shelf fail."""
+
+    def failing(writes: Sequence[PendingWrite]) -> None:
+        raise OSError("tier is down")
+
+    shelf.apply_writes = failing  # type: ignore[method-assign]
+
+
+def anchor() -> Anchor:
+    """New anchor with changes to write."""
+    return Root().__jac__
+
+
+def test_coalescing(shelf):
+    """Only the latest write of an anchor queued behind a flush is applied."""
+    applying, release, batches = gate(shelf)
+    queue = WriteBehind(shelf, shelf.journal_path)
+    first, second = anchor(), anchor()
+    queue.put(shelf.snapshot([first]))
+    assert applying.wait(5)
+    queue.put([PendingWrite(str(second.id), shelf.codec.dumps(second))])
+    queue.put([PendingWrite(str(second.id))])
+    queue.put([PendingWrite(str(second.id), shelf.codec.dumps(second))])
+
+    assert len(queue.writes()) == 2
+    release.set()
+    assert queue.flush(5)
+    assert batches == [[str(first.id)], [str(second.id)]]
+    assert shelf.find_by_id(first.id) is not None
+    assert shelf.find_by_id(second.id) is not None
+    assert queue.close(5)
+
+
+def test_back_pressure(shelf):
+    """Writers wait while the queue is full."""
+    _, release, _ = gate(shelf)
+    queue = WriteBehind(shelf, shelf.journal_path, max_pending=1)
+    queue.put(shelf.snapshot([anchor()]))
+    writer = Thread(target=queue.put, args=(shelf.snapshot([anchor()]),))
+    writer.start()
+    writer.join(0.2)
+    assert writer.is_alive()
+
+    release.set()
+    writer.join(5)
+    assert not writer.is_alive()
+    assert queue.flush(5)
+    assert queue.close(5)
+
+
+def test_flush(shelf):
+    """Flushing waits until the queued writes are applied, up to a timeout."""
+    _, release, _ = gate(shelf)
+    queue = WriteBehind(shelf, shelf.journal_path)
+    written = anchor()
+    queue.put(shelf.snapshot([written]))
+    assert not queue.flush(0.1)
+    assert str(written.id) in queue.find([str(written.id)])
+
+    release.set()
+    assert queue.flush(5)
+    assert queue.find([str(written.id)]) == {}
+    assert shelf.find_by_id(written.id) is not None
+    assert queue.close(5)
+
+
+def test_journal_replay(shelf, tmp_path):
+    """Writes not applied on close are applied by the next queue on the journal."""
+    fail(shelf)
+    queue = WriteBehind(shelf, shelf.journal_path, retry_interval=60)
+    written, removed = anchor(), anchor()
+    queue.put(shelf.snapshot([written, removed]))
+    queue.put([PendingWrite(str(removed.id))])
+    # A second queue gets a journal of its own and leaves the locked one.
+    other = WriteBehind(shelf, shelf.journal_path)
+    assert other.journal_path != queue.journal_path
+    assert other.writes() == {}
+    assert other.close(5)
+    assert not queue.close(0.1)
+    shelf.close()
+
+    replayed = ShelfDB(shelf_path=str(tmp_path / "anchors.db"))
+    queue = WriteBehind(replayed, replayed.journal_path)
+    assert queue.flush(5)
+    assert replayed.find_by_id(written.id) is not None
+    assert replayed.find_by_id(removed.id) is None
+    assert queue.close(5)
+    assert os.path.getsize(queue.journal_path) == 0
+    replayed.close()
+
+
+def stop_with_writes(path: str, journal: Queue, stop: ProcessEvent) -> None:
+    """Queue a write that is never applied, then stop without closing."""
+    store = ShelfDB(shelf_path=path)
+    fail(store)
+    queue = WriteBehind(store, store.journal_path, retry_interval=60)
+    written = anchor()
+    queue.put(store.snapshot([written]))
+    journal.put((queue.journal_path, str(written.id)))
+    stop.wait(10)
+    os._exit(0)
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Needs fork")
+def test_journal_per_process(shelf, tmp_path):
+    """Each process journals its writes, a stopped one's are taken over."""
+    context = multiprocessing.get_context("fork")
+    journal, stop = context.Queue(), context.Event()
+    process = context.Process(
+        target=stop_with_writes,
+        args=(str(tmp_path / "anchors.db"), journal, stop),
+    )
+    process.start()
+    path, id = journal.get(timeout=10)
+
+    # The journal of a running process is left alone.
+    queue = WriteBehind(shelf, shelf.journal_path)
+    assert queue.journal_path != path
+    assert queue.writes() == {}
+    stop.set()
+    process.join(10)
+    assert queue.close(5)
+
+    queue = WriteBehind(shelf, shelf.journal_path)
+    assert queue.flush(5)
+    assert shelf.find_by_id(UUID(id)) is not None
+    assert not os.path.exists(path)
+    assert queue.close(5)
+
+
+def test_quarantine(shelf):
+    """Writes failing every retry are moved out of the queue."""
+    fail(shelf)
+    queue = WriteBehind(shelf, shelf.journal_path, retry_interval=0, max_retries=2)
+    written = anchor()
+    queue.put(shelf.snapshot([written]))
+    assert queue.flush(5)
+    assert queue.writes() == {}
+    with open(queue.quarantine_path, "rb") as quarantine:
+        assert pickle.load(quarantine)[0] == str(written.id)
+    assert queue.close(5)
+
+
+def test_index(shelf, tmp_path):
+    """Anchors are listed under one set of ids per archetype."""
+    first, second = anchor(), anchor()
+    shelf.apply_writes(shelf.snapshot([first, second]))
+    key = f"type:{Memory.class_name(Root)}"
+    assert shelf._ensure_shelf()[key] == {str(first.id), str(second.id)}
+    assert {a.id for a in shelf.find_by_type([Memory.class_name(Root)])} == {
+        first.id,
+        second.id,
+    }
+
+    shelf.remove(first)
+    assert shelf._ensure_shelf()[key] == {str(second.id)}
+
+    # Shelves written without the current index are indexed when opened.
+    del shelf._ensure_shelf()[SHELF_INDEX_VERSION_KEY]
+    del shelf._ensure_shelf()[key]
+    shelf.close()
+    reopened = ShelfDB(shelf_path=str(tmp_path / "anchors.db"))
+    assert [a.id for a in reopened.find_by_type([Memory.class_name(Root)])] == [
+        second.id
+    ]
+    reopened.close()
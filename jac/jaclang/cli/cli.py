@@ -131,43 +131,49 @@ def run(
         jac run myscript.py
         jac run myprogram.jac --session mysession
         jac run myprogram.jac --no-main
+        jac run myprogram.jac --no-cache
     """
     # if no session specified, check if it was defined via global CLI args
     # otherwise default to jaclang.session
     base, mod, mach = proc_file_sess(filename, session)
     lng = filename.split(".")[-1]
     Jac.set_base_path(base)
-
-    if filename.endswith((".jac", ".py")):
-        try:
-            Jac.jac_import(
-                target=mod,
-                base_path=base,
-                override_name="__main__" if main else None,
-                lng=lng,
-            )
-        except Exception as e:
-            from jaclang.utils.helpers import dump_traceback
-
-            print(dump_traceback(e), file=sys.stderr)
-            mach.close()
-            exit(1)
-    elif filename.endswith(".jir"):
-        try:
-            with open(filename, "rb") as f:
-                Jac.attach_program(pickle.load(f))
+    # Reuse compiled modules from __jac_cache__ for the duration of this run.
+    prev_cache = settings.bytecode_cache
+    settings.bytecode_cache = cache
+    try:
+        if filename.endswith((".jac", ".py")):
+            try:
                 Jac.jac_import(
                     target=mod,
                     base_path=base,
                     override_name="__main__" if main else None,
                     lng=lng,
                 )
-        except Exception as e:
-            from jaclang.utils.helpers import dump_traceback
+            except Exception as e:
+                from jaclang.utils.helpers import dump_traceback
 
-            print(dump_traceback(e), file=sys.stderr)
-            mach.close()
-            exit(1)
+                print(dump_traceback(e), file=sys.stderr)
+                mach.close()
+                exit(1)
+        elif filename.endswith(".jir"):
+            try:
+                with open(filename, "rb") as f:
+                    Jac.attach_program(pickle.load(f))
+                    Jac.jac_import(
+                        target=mod,
+                        base_path=base,
+                        override_name="__main__" if main else None,
+                        lng=lng,
+                    )
+            except Exception as e:
+                from jaclang.utils.helpers import dump_traceback
+
+                print(dump_traceback(e), file=sys.stderr)
+                mach.close()
+                exit(1)
+    finally:
+        settings.bytecode_cache = prev_cache
 
     mach.close()
 
@@ -222,7 +228,7 @@ def get_object(filename: str, id: str, session: str = "", main: bool = True) ->
 
 
 @cmd_registry.register
-def build(filename: str, typecheck: bool = False) -> None:
+def build(filename: str, typecheck: bool = False, jobs: int = 1) -> None:
     """Build the specified .jac file.
 
     Compiles a Jac source file into a Jac Intermediate Representation (.jir) file,
@@ -231,15 +237,21 @@ def build(filename: str, typecheck: bool = False) -> None:
     Args:
         filename: Path to the .jac file to build
         typecheck: Perform type checking during build (default: False)
+        jobs: Also compile imported modules across this many processes, 0 for all cores (default: 1)
 
     Examples:
         jac build myprogram.jac
         jac build myprogram.jac --typecheck
+        jac build myprogram.jac --jobs 8
     """
     if not filename.endswith(".jac"):
         print("Not a .jac file.", file=sys.stderr)
         exit(1)
-    (out := JacProgram()).compile(file_path=filename, type_check=typecheck)
+    out = JacProgram()
+    if jobs == 1:
+        out.compile(file_path=filename, type_check=typecheck)
+    else:
+        out.build(file_path=filename, type_check=typecheck, jobs=jobs)
     errs = len(out.errors_had)
     warnings = len(out.warnings_had)
     print(f"Errors: {errs}, Warnings: {warnings}")
@@ -723,6 +735,11 @@ def serve(
     port: int = 8000,
     main: bool = True,
     faux: bool = False,
+    workers: int = 8,
+    queue_size: int = 64,
+    timeout: float = 30.0,
+    request_timeout: float = 60.0,
+    keepalive: float = 5.0,
 ) -> None:
     """Start a REST API server for the specified .jac file.
 
@@ -740,12 +757,19 @@ def serve(
         port: Port to run the server on (default: 8000)
         main: Treat the module as __main__ (default: True)
         faux: Perform introspection and print endpoint docs without starting server (default: False)
+        workers: Number of requests served concurrently (default: 8)
+        queue_size: Number of connections that may wait for a worker (default: 64)
+        timeout: Seconds before a stalled connection is dropped (default: 30.0)
+        request_timeout: Seconds a function or walker may run before the request
+            gets a 504, 0 for no limit (default: 60.0)
+        keepalive: Seconds an idle connection is kept open (default: 5.0)
 
     Examples:
         jac serve myprogram.jac
         jac serve myprogram.jac --port 8080
         jac serve myprogram.jac --session myapp.session
         jac serve myprogram.jac --faux
+        jac serve myprogram.jac --workers 16 --timeout 60
     """
     from jaclang.runtimelib.server import JacAPIServer
 
@@ -789,6 +813,11 @@ def serve(
         session_path=session_path,
         port=port,
         base_path=base,
+        workers=workers,
+        queue_size=queue_size,
+        connection_timeout=timeout,
+        request_timeout=request_timeout or None,
+        keepalive_timeout=keepalive,
     )
 
     # If faux mode, print endpoint documentation and exit
@@ -0,0 +1,147 @@
+"""On-disk bytecode cache for Jac modules.
+
+Compiled modules are stored in a ``__jac_cache__`` directory next to their
+source, much like Python's ``__pycache__``. An entry is only reused when the
+compiler fingerprint, the relevant settings and the content of the module, all
+of its annex files (.impl.jac, .cl.jac, .test.jac) and the modules it imports
+still match.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import importlib.util
+import marshal
+import os
+import sys
+import tempfile
+from functools import cache
+from importlib.metadata import PackageNotFoundError, version
+
+from jaclang.compiler.passes.main.annex_pass import JacAnnexPass
+from jaclang.settings import settings
+from jaclang.utils.log import logging
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = "__jac_cache__"
+CACHE_EXT = ".jbc"
+
+
+@cache
+def compiler_fingerprint() -> str:
+    """Return a digest identifying the running compiler build."""
+    try:
+        jac_version = version("jaclang")
+    except PackageNotFoundError:
+        jac_version = "0"
+    digest = hashlib.sha256()
+    digest.update(importlib.util.MAGIC_NUMBER)
+    digest.update(jac_version.encode())
+    # Source edits to the compiler (e.g. editable installs) invalidate entries.
+    compiler_dir = os.path.dirname(__file__)
+    for root, dirs, files in os.walk(compiler_dir):
+        dirs[:] = sorted(d for d in dirs if d != "tests" and d != "__pycache__")
+        for file in sorted(files):
+            if file.endswith((".py", ".jac", ".lark")):
+                stat = os.stat(os.path.join(root, file))
+                digest.update(f"{file}:{stat.st_mtime_ns}:{stat.st_size}".encode())
+    return digest.hexdigest()
+
+
+def file_digest(file_path: str) -> str:
+    """Return the content digest of a file."""
+    with open(file_path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+class BytecodeCache:
+    """Persistent bytecode cache keyed on source hash, compiler and settings."""
+
+    @staticmethod
+    def cache_path(file_path: str) -> str:
+        """Return the cache file location for a module source path."""
+        directory, file_name = os.path.split(os.path.abspath(file_path))
+        tag = sys.implementation.cache_tag or "jac"
+        return os.path.join(directory, CACHE_DIR, f"{file_name[:-4]}.{tag}{CACHE_EXT}")
+
+    @staticmethod
+    def cache_key(file_path: str) -> str:
+        """Return the key an entry must match to be valid for this process."""
+        return hashlib.sha256(
+            "|".join(
+                [
+                    compiler_fingerprint(),
+                    os.path.abspath(file_path),
+                    str(settings.ignore_test_annex),
+                    str(settings.predynamo_pass),
+                ]
+            ).encode()
+        ).hexdigest()
+
+    @staticmethod
+    def dependencies(file_path: str) -> list[str]:
+        """Return the source files that make up a module."""
+        return [file_path, *JacAnnexPass.find_annex_paths(file_path)]
+
+    @staticmethod
+    def load(file_path: str) -> tuple[bytes, dict[str, str]] | None:
+        """Return the cached bytecode and py_raise_map of a module, if valid."""
+        if not file_path.endswith(".jac"):
+            return None
+        try:
+            with open(BytecodeCache.cache_path(file_path), "rb") as f:
+                entry = marshal.load(f)
+            if entry["key"] != BytecodeCache.cache_key(file_path):
+                return None
+            deps: dict[str, str] = entry["deps"]
+            # New annex files are missing from the deps, removed ones fail to hash.
+            if not set(BytecodeCache.dependencies(file_path)) <= set(deps):
+                return None
+            for dep, digest in deps.items():
+                if file_digest(dep) != digest:
+                    return None
+            return entry["code"], entry["py_raise_map"]
+        except (OSError, EOFError, ValueError, TypeError, KeyError):
+            return None
+
+    @staticmethod
+    def store(
+        file_path: str,
+        code: bytes,
+        py_raise_map: dict[str, str],
+        imports: list[str] | None = None,
+    ) -> None:
+        """Write the compiled bytecode of a module to the cache.
+
+        ``py_raise_map`` holds the entries added by compiling the module and
+        ``imports`` the source files of the modules it imports.
+        """
+        if not file_path.endswith(".jac"):
+            return
+        cache_path = BytecodeCache.cache_path(file_path)
+        try:
+            entry = {
+                "key": BytecodeCache.cache_key(file_path),
+                "deps": {
+                    dep: file_digest(dep)
+                    for dep in [
+                        *BytecodeCache.dependencies(file_path),
+                        *(imports or []),
+                    ]
+                },
+                "code": code,
+                "py_raise_map": dict(py_raise_map),
+            }
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            # Write then rename so concurrent processes never see partial entries.
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(cache_path))
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    marshal.dump(entry, f)
+                os.replace(tmp_path, cache_path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except (OSError, ValueError) as e:
+            logger.debug(f"Unable to write bytecode cache for {file_path}: {e}")
@@ -7,7 +7,7 @@ import os
 import sys
 from collections.abc import Callable, Sequence
 from dataclasses import dataclass
-from threading import Event
+from threading import Event, local
 from typing import TYPE_CHECKING, TypeAlias, TypeVar, cast
 
 import jaclang.compiler.unitree as uni
@@ -44,10 +44,14 @@ class LarkParseOutput:
 class LarkParseTransform(Transform[LarkParseInput, LarkParseOutput]):
     """Transform for Lark parsing step."""
 
-    comment_cache: list[jl.Token] = []
+    # The shared lexer reports comments to the list of the parse running on the
+    # current thread, so concurrent parses keep their comments apart.
+    active = local()
     parser = jl.Lark_StandAlone(
         lexer_callbacks={
-            "COMMENT": lambda comment: LarkParseTransform.comment_cache.append(comment)
+            "COMMENT": lambda comment: LarkParseTransform.active.comments.append(
+                comment
+            )
         }  # type: ignore
     )
 
@@ -57,12 +61,10 @@ class LarkParseTransform(Transform[LarkParseInput, LarkParseOutput]):
 
     def transform(self, ir_in: LarkParseInput) -> LarkParseOutput:
         """Transform input IR by parsing with Lark."""
-        LarkParseTransform.comment_cache = []
+        self.comments: list[jl.Token] = []
+        LarkParseTransform.active.comments = self.comments
         tree = LarkParseTransform.parser.parse(ir_in.ir_value, on_error=ir_in.on_error)
-        return LarkParseOutput(
-            tree=tree,
-            comments=LarkParseTransform.comment_cache.copy(),
-        )
+        return LarkParseOutput(tree=tree, comments=self.comments)
 
 
 class JacParser(Transform[uni.Source, uni.Module]):
@@ -31,21 +31,53 @@ class JacAnnexPass(Transform[uni.Module, uni.Module]):
     def transform(self, ir_in: uni.Module) -> uni.Module:
         """Initialize JacAnnexPass with the module path."""
         self.mod_path = ir_in.loc.mod_path
-        self.base_path = self.mod_path[:-4]
-        self.impl_folder = self.base_path + ".impl"
-        self.test_folder = self.base_path + ".test"
-        self.cl_folder = self.base_path + ".cl"
-        self.directory = os.path.dirname(self.mod_path) or os.getcwd()
         self.load_annexes(jac_program=self.prog, node=ir_in)
         return ir_in
 
-    def find_annex_paths(self) -> list[str]:
-        """Return list of .impl.jac and .test.jac files related to base module."""
-        paths = [os.path.join(self.directory, f) for f in os.listdir(self.directory)]
-        for folder in [self.impl_folder, self.test_folder, self.cl_folder]:
+    @staticmethod
+    def find_annex_paths(mod_path: str) -> list[str]:
+        """Return the .impl.jac, .cl.jac and .test.jac files of a base module."""
+        base_path = mod_path[:-4]
+        impl_folder = base_path + ".impl"
+        test_folder = base_path + ".test"
+        cl_folder = base_path + ".cl"
+        directory = os.path.dirname(mod_path) or os.getcwd()
+
+        paths = [os.path.join(directory, f) for f in os.listdir(directory)]
+        for folder in [impl_folder, test_folder, cl_folder]:
             if os.path.exists(folder):
                 paths += [os.path.join(folder, f) for f in os.listdir(folder)]
-        return paths
+
+        annexes = []
+        for path in paths:
+            if path == mod_path:
+                continue
+            if (
+                (
+                    path.endswith(".impl.jac")
+                    and (
+                        path.startswith(f"{base_path}.")
+                        or os.path.dirname(path) == impl_folder
+                    )
+                )
+                or (
+                    path.endswith(".cl.jac")
+                    and (
+                        path.startswith(f"{base_path}.")
+                        or os.path.dirname(path) == cl_folder
+                    )
+                )
+                or (
+                    path.endswith(".test.jac")
+                    and not settings.ignore_test_annex
+                    and (
+                        path.startswith(f"{base_path}.")
+                        or os.path.dirname(path) == test_folder
+                    )
+                )
+            ):
+                annexes.append(path)
+        return annexes
 
     def load_annexes(self, jac_program: JacProgram, node: uni.Module) -> None:
         """Parse and attach annex modules to the node."""
@@ -55,35 +87,17 @@ class JacAnnexPass(Transform[uni.Module, uni.Module]):
             self.log_error("Module path is empty.")
             return
 
-        for path in self.find_annex_paths():
-            if path == self.mod_path:
-                continue
-
-            if path.endswith(".impl.jac") and (
-                path.startswith(f"{self.base_path}.")
-                or os.path.dirname(path) == self.impl_folder
-            ):
+        for path in self.find_annex_paths(self.mod_path):
+            if path.endswith(".impl.jac"):
                 mod = jac_program.compile(file_path=path, no_cgen=True)
                 if mod:
                     node.impl_mod.append(mod)
-
-            elif path.endswith(".cl.jac") and (
-                path.startswith(f"{self.base_path}.")
-                or os.path.dirname(path) == self.cl_folder
-            ):
+            elif path.endswith(".cl.jac"):
                 mod = jac_program.compile(file_path=path, no_cgen=True)
                 if mod:
                     self._mark_client_declarations(mod)
                     node.impl_mod.append(mod)
-
-            elif (
-                path.endswith(".test.jac")
-                and not settings.ignore_test_annex
-                and (
-                    path.startswith(f"{self.base_path}.")
-                    or os.path.dirname(path) == self.test_folder
-                )
-            ):
+            else:
                 mod = jac_program.compile(file_path=path, no_cgen=True)
                 if mod:
                     node.test_mod.append(mod)
@@ -14,11 +14,14 @@ from collections.abc import Sequence
 
 import jaclang.compiler.unitree as uni
 from jaclang.compiler.passes import UniPass
+from jaclang.compiler.passes.main.def_impl_match_pass import DeclImplMatchPass
 
 
 class CFGBuildPass(UniPass):
     """Jac Symbol table build pass."""
 
+    requires = (DeclImplMatchPass,)
+
     def before_pass(self) -> None:
         """Before pass."""
         self.while_loop_stack: list[list[uni.UniCFGNode]] = []
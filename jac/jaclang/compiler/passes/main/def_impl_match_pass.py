@@ -179,6 +179,7 @@ class DeclImplMatchPass(Transform[uni.Module, uni.Module]):
                         if (par := params_decl[idx].parent) is not None:
                             loc_in_kid = par.kid.index(params_decl[idx])
                             par.kid[loc_in_kid] = params_defn[idx]
+                            par.mark_sub_node_tab_stale()
                         params_decl[idx] = params_defn[idx]
 
     def check_archetypes(self, ir_in: uni.Module) -> None:
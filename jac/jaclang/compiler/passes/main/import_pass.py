@@ -53,6 +53,34 @@ class JacImportDepsPass(Transform[uni.Module, uni.Module]):
 
         return ir_in
 
+    @staticmethod
+    def import_targets(mod: uni.Module) -> list[str]:
+        """Return the source files of the modules a module imports.
+
+        Follows the same resolution as the pass but without compiling, so
+        JacProgram.compile_imports can compile the targets ahead of the pass.
+        """
+        targets: list[str] = []
+        for node in UniPass.get_all_sub_nodes(mod, uni.ModulePath):
+            import_node = node.parent_of_type(uni.Import)
+            target = node.resolve_relative_path()
+            if target.endswith((".js", ".ts", ".jsx", ".tsx")) or (
+                import_node.is_jac and not os.path.isdir(target)
+            ):
+                targets.append(target)
+            elif import_node.is_jac:
+                targets.append(os.path.join(target, "__init__.jac"))
+                if node == import_node.from_loc:
+                    for i in import_node.items:
+                        if isinstance(i, uni.ModuleItem):
+                            from_mod_target = node.resolve_relative_path(i.name.value)
+                            if os.path.isdir(from_mod_target):
+                                from_mod_target = os.path.join(
+                                    from_mod_target, "__init__.jac"
+                                )
+                            targets.append(from_mod_target)
+        return [target for target in targets if os.path.isfile(target)]
+
     def process_import(self, i: uni.ModulePath) -> None:
         """Process an import."""
         imp_node = i.parent_of_type(uni.Import)
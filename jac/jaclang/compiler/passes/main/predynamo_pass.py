@@ -53,6 +53,7 @@ class PreDynamoPass(UniPass):
             if old_node in parent.kid:
                 idx = parent.kid.index(old_node)
                 parent.kid[idx] = new_nodes
+                parent.mark_sub_node_tab_stale()
         else:  # list of nodes
             for n in new_nodes:
                 n.parent = parent
@@ -64,6 +65,7 @@ class PreDynamoPass(UniPass):
             if old_node in parent.kid:
                 idx = parent.kid.index(old_node)
                 parent.kid = parent.kid[:idx] + new_nodes + parent.kid[idx + 1 :]
+                parent.mark_sub_node_tab_stale()
 
     def check_same_lhs(
         self, assign_a: uni.UniNode, assign_b: uni.UniNode
@@ -31,6 +31,7 @@ from jaclang.compiler.constant import EdgeDir
 from jaclang.compiler.constant import Tokens as Tok
 from jaclang.compiler.passes.ast_gen import BaseAstGenPass
 from jaclang.compiler.passes.ast_gen.jsx_processor import PyJsxProcessor
+from jaclang.compiler.passes.main.predynamo_pass import PreDynamoPass
 
 T = TypeVar("T", bound=ast3.AST)
 
@@ -94,6 +95,9 @@ UNARY_OP_MAP: dict[Tok, type[ast3.unaryop]] = {
 class PyastGenPass(BaseAstGenPass[ast3.AST]):
     """Jac blue transpilation to python pass."""
 
+    # Independent of the ES AST, so it is generated in the same traversal.
+    requires = (PreDynamoPass,)
+
     def before_pass(self) -> None:
         self.child_passes: list[PyastGenPass] = self._init_child_passes(PyastGenPass)
         self.debuginfo: dict[str, list[str]] = {"jac_mods": []}
@@ -902,9 +906,17 @@ class PyastGenPass(BaseAstGenPass[ast3.AST]):
             self.traverse(node.body)
 
     def _invoke_llm_call(
-        self, model: ast3.expr, caller: ast3.expr, args: ast3.Dict
-    ) -> ast3.Call:
-        """Reusable method to codegen call_llm(model, caller, args)."""
+        self,
+        model: ast3.expr,
+        caller: ast3.expr,
+        args: ast3.Dict,
+        is_async: bool = False,
+    ) -> ast3.expr:
+        """Reusable method to codegen call_llm(model, caller, args).
+
+        Async abilities await acall_llm instead so the LLM call does not block
+        the event loop.
+        """
         mtir_ast = self.sync(
             ast3.Call(
                 func=self.jaclib_obj("get_mtir"),
@@ -937,9 +949,9 @@ class PyastGenPass(BaseAstGenPass[ast3.AST]):
                 ],
             )
         )
-        return self.sync(
+        llm_call = self.sync(
             ast3.Call(
-                func=self.jaclib_obj("call_llm"),
+                func=self.jaclib_obj("acall_llm" if is_async else "call_llm"),
                 args=[],
                 keywords=[
                     self.sync(
@@ -957,6 +969,7 @@ class PyastGenPass(BaseAstGenPass[ast3.AST]):
                 ],
             )
         )
+        return self.sync(ast3.Await(value=llm_call)) if is_async else llm_call
 
     def gen_llm_body(self, node: uni.Ability) -> list[ast3.stmt]:
         """Generate the by LLM body."""
@@ -1002,7 +1015,10 @@ class PyastGenPass(BaseAstGenPass[ast3.AST]):
         )
 
         llm_call = self._invoke_llm_call(
-            model=cast(ast3.expr, node.body.gen.py_ast[0]), caller=caller, args=args
+            model=cast(ast3.expr, node.body.gen.py_ast[0]),
+            caller=caller,
+            args=args,
+            is_async=node.is_async,
         )
 
         # Attach docstring if exists and the llm call.
@@ -2950,13 +2966,18 @@ class PyastGenPass(BaseAstGenPass[ast3.AST]):
         while True:
             keywords = []
             if cur.filter_cond:
+                # A bare type filter is passed as the type itself so the runtime
+                # can look edges up by class instead of testing every edge.
+                edge_filter = (
+                    cur.filter_cond.f_type
+                    if cur.filter_cond.f_type and not cur.filter_cond.compares
+                    else cur.filter_cond
+                )
                 keywords.append(
                     self.sync(
                         ast3.keyword(
                             arg="edge",
-                            value=cast(
-                                ast3.expr, self.sync(cur.filter_cond.gen.py_ast[0])
-                            ),
+                            value=cast(ast3.expr, self.sync(edge_filter.gen.py_ast[0])),
                         )
                     )
                 )
@@ -1,7 +1,12 @@
 """Tests for typechecker pass (the pyright implementation)."""
 
+import os
+import tempfile
+from unittest.mock import patch
+
 from jaclang.compiler.passes.main import TypeCheckPass
 from jaclang.compiler.program import JacProgram
+from jaclang.compiler.type_system import stub_cache
 from jaclang.utils.test import TestCase
 
 
@@ -768,3 +773,24 @@ class TypeCheckerPassTests(TestCase):
         mod = program.compile(path, no_cgen=True)
         # The client.cl.jac imports TypeScript modules - verify it compiles
         self.assertIsNotNone(mod)
+
+    def test_stub_cache(self) -> None:
+        """Test the builtin stubs are reused from the on-disk cache."""
+        with (
+            tempfile.TemporaryDirectory() as cache_dir,
+            patch.object(stub_cache, "CACHE_DIR", cache_dir),
+        ):
+            built = JacProgram().get_type_evaluator()
+            self.assertEqual(len(os.listdir(cache_dir)), 1)
+            program = JacProgram()
+            cached = program.get_type_evaluator()
+        self.assertIsNot(built.builtins_module, cached.builtins_module)
+        self.assertIs(
+            program.mod.hub[cached.builtins_module.loc.mod_path],
+            cached.builtins_module,
+        )
+        self.assertEqual(str(cached.prefetch.int_class), str(built.prefetch.int_class))
+        self.assertIs(
+            cached.prefetch.int_class.shared.symbol_table,
+            cached.builtins_module.lookup("int").decl.name_of,
+        )
@@ -25,6 +25,20 @@ class ImportPassPassTests(TestCase):
         mod = out.mod.hub[self.fixture_abs_path("impl/imps.jac")]
         self.assertIn("56", str(mod.to_dict()))
 
+    def test_parallel_build(self) -> None:
+        """Test imported modules compiled in a process pool match a serial build."""
+        file_path = self.fixture_abs_path("base.jac")
+        (serial := JacProgram()).build(file_path)
+        (parallel := JacProgram()).build(file_path, jobs=2)
+        self.assertFalse(parallel.errors_had)
+        self.assertEqual(set(serial.mod.hub), set(parallel.mod.hub))
+        imps = self.fixture_abs_path("impl/imps.jac")
+        self.assertEqual(
+            serial.mod.hub[imps].gen.py_bytecode,
+            parallel.mod.hub[imps].gen.py_bytecode,
+        )
+        self.assertIn("56", str(parallel.mod.hub[imps].to_dict()))
+
     def test_import_auto_impl(self) -> None:
         """Basic test for pass."""
         (prog := JacProgram()).compile(self.fixture_abs_path("autoimpl.jac"))
@@ -1,6 +1,8 @@
 """Test sub node pass module."""
 
+import jaclang.compiler.unitree as uni
 from jaclang.compiler.passes import UniPass
+from jaclang.compiler.passes.uni_pass import FusedPass
 from jaclang.compiler.program import JacProgram
 from jaclang.utils.test import TestCase
 
@@ -22,3 +24,75 @@ class SubNodePassTests(TestCase):
                 for n in v:
                     self.assertIn(n, UniPass.get_all_sub_nodes(i, k, brute_force=True))
         self.assertFalse(out.errors_had)
+
+    def test_unhandled_subtrees_skipped(self) -> None:
+        """Test passes skip subtrees without node types they handle."""
+        mod = JacProgram().compile(
+            file_path=self.examples_abs_path("manual_code/circle.jac")
+        )
+        found: list[uni.Ability] = []
+        visited: list[uni.UniNode] = []
+
+        class AbilityPass(UniPass):
+            def enter_ability(self, node: uni.Ability) -> None:
+                found.append(node)
+
+            def traverse(self, node: uni.UniNode) -> uni.UniNode:
+                visited.append(node)
+                return super().traverse(node)
+
+        AbilityPass(ir_in=mod, prog=JacProgram())
+        self.assertEqual(found, UniPass.get_all_sub_nodes(mod, uni.Ability))
+        self.assertLess(len(visited), sum(map(len, mod._sub_node_tab.values())))
+
+        # Subtrees whose kids changed are always visited.
+        name = mod.get_all_sub_nodes(uni.Name)[0]
+        self.assertNotIn(name, visited)
+        name.mark_sub_node_tab_stale()
+        AbilityPass(ir_in=mod, prog=JacProgram())
+        self.assertIn(name, visited)
+
+    def test_fused_pass(self) -> None:
+        """Test fused passes call their hooks in order in one traversal."""
+        mod = JacProgram().compile(
+            file_path=self.examples_abs_path("manual_code/circle.jac")
+        )
+        calls: list[tuple[str, uni.UniNode]] = []
+
+        class FirstPass(UniPass):
+            def enter_ability(self, node: uni.Ability) -> None:
+                calls.append(("first", node))
+                self.prune()
+
+        class SecondPass(UniPass):
+            requires = ()
+
+            def enter_ability(self, node: uni.Ability) -> None:
+                calls.append(("second", node))
+
+            def enter_return_stmt(self, node: uni.ReturnStmt) -> None:
+                calls.append(("second", node))
+
+        class ThirdPass(UniPass):
+            requires = (FirstPass,)
+
+        self.assertEqual(
+            FusedPass.group([FirstPass, SecondPass, ThirdPass]),
+            [[FirstPass, SecondPass], [ThirdPass]],
+        )
+        fused = FusedPass(ir_in=mod, prog=JacProgram(), passes=[FirstPass, SecondPass])
+        self.assertEqual([type(i) for i in fused.passes], [FirstPass, SecondPass])
+
+        # Pruning by one pass does not stop the others from descending.
+        abilities = UniPass.get_all_sub_nodes(mod, uni.Ability)
+        returns = UniPass.get_all_sub_nodes(mod, uni.ReturnStmt)
+        self.assertTrue(abilities and returns)
+        self.assertEqual(
+            [n for (name, n) in calls if name == "first"],
+            abilities,
+        )
+        self.assertEqual(
+            [n for (name, n) in calls if name == "second"],
+            sorted(abilities + returns, key=lambda n: n.loc.pos_start),
+        )
+        self.assertEqual(calls[:2], [("first", abilities[0]), ("second", abilities[0])])
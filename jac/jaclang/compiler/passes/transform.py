@@ -72,6 +72,15 @@ class Transform(ABC, Generic[T, R]):
         self, ir_in: T, prog: JacProgram, cancel_token: Event | None = None
     ) -> None:
         """Initialize pass."""
+        self.setup(ir_in, prog, cancel_token=cancel_token)
+        self.pre_transform()
+        self.ir_out: R = self.timed_transform(ir_in=ir_in)
+        self.post_transform()
+
+    def setup(
+        self, ir_in: T, prog: JacProgram, cancel_token: Event | None = None
+    ) -> None:
+        """Set up the pass state without running the pass."""
         self.logger = logging.getLogger(self.__class__.__name__)
         self.errors_had: list[Alert] = []
         self.warnings_had: list[Alert] = []
@@ -80,9 +89,6 @@ class Transform(ABC, Generic[T, R]):
         self.time_taken = 0.0
         self.ir_in: T = ir_in
         self.cancel_token = cancel_token
-        self.pre_transform()
-        self.ir_out: R = self.timed_transform(ir_in=ir_in)
-        self.post_transform()
 
     def timed_transform(
         self,
@@ -93,11 +99,15 @@ class Transform(ABC, Generic[T, R]):
         ir_out = self.transform(ir_in=ir_in)
         self.time_taken = time.time() - start_time
         if settings.pass_timer:
-            self.log_info(
-                f"Time taken in {self.__class__.__name__}: {self.time_taken:.4f} seconds"
-            )
+            self.log_time()
         return ir_out
 
+    def log_time(self) -> None:
+        """Log the time taken by the pass."""
+        self.log_info(
+            f"Time taken in {self.__class__.__name__}: {self.time_taken:.4f} seconds"
+        )
+
     def pre_transform(self) -> None:
         """Pre-transform hook."""
         pass
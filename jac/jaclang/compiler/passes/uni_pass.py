@@ -2,11 +2,14 @@
 
 from __future__ import annotations
 
+import time
+from collections.abc import Callable, Sequence
 from threading import Event
-from typing import TYPE_CHECKING, TypeVar
+from typing import TYPE_CHECKING, ClassVar, TypeVar
 
 import jaclang.compiler.unitree as uni
 from jaclang.compiler.passes.transform import Transform
+from jaclang.settings import settings
 from jaclang.utils.helpers import pascal_to_snake
 
 if TYPE_CHECKING:
@@ -14,20 +17,41 @@ if TYPE_CHECKING:
 
 T = TypeVar("T", bound=uni.UniNode)
 
+Handler = Callable[["UniPass", uni.UniNode], None]
+
 
 class UniPass(Transform[uni.Module, uni.Module]):
     """Abstract class for IR passes."""
 
-    def __init__(
+    # Enter and exit handlers of each node type, None if it has neither. Built
+    # per pass class on first use instead of looked up by name on every visit.
+    handlers: ClassVar[dict[type, tuple[Handler | None, Handler | None] | None]] = {}
+    # Whether subtrees without handled node types can be skipped, which is only
+    # the case when enter_node and exit_node are not overridden.
+    skip_unhandled: ClassVar[bool] = True
+    # Passes of the same schedule whose results on the whole tree this pass
+    # reads. None means all earlier passes; otherwise the pass may share one
+    # traversal with the passes right before it that it does not require.
+    requires: ClassVar[tuple[type[Transform], ...] | None] = None
+
+    def __init_subclass__(cls, **kwargs: object) -> None:
+        """Give every pass class its own handler table."""
+        super().__init_subclass__(**kwargs)
+        cls.handlers = {}
+        cls.skip_unhandled = (
+            cls.enter_node is UniPass.enter_node and cls.exit_node is UniPass.exit_node
+        )
+
+    def setup(
         self,
         ir_in: uni.Module,
         prog: JacProgram,
         cancel_token: Event | None = None,
     ) -> None:
-        """Initialize parser."""
+        """Set up the pass state without running the pass."""
         self.term_signal = False
         self.prune_signal = False
-        Transform.__init__(self, ir_in, prog, cancel_token=cancel_token)
+        super().setup(ir_in, prog, cancel_token=cancel_token)
 
     def before_pass(self) -> None:
         """Run once before pass."""
@@ -35,15 +59,39 @@ class UniPass(Transform[uni.Module, uni.Module]):
     def after_pass(self) -> None:
         """Run once after pass."""
 
+    @classmethod
+    def get_handlers(
+        cls, node_type: type
+    ) -> tuple[Handler | None, Handler | None] | None:
+        """Get the enter and exit handlers of a node type."""
+        try:
+            return cls.handlers[node_type]
+        except KeyError:
+            name = pascal_to_snake(node_type.__name__)
+            on_enter = getattr(cls, f"enter_{name}", None)
+            on_exit = getattr(cls, f"exit_{name}", None)
+            handlers = (on_enter, on_exit) if on_enter or on_exit else None
+            cls.handlers[node_type] = handlers
+            return handlers
+
     def enter_node(self, node: uni.UniNode) -> None:
         """Run on entering node."""
-        if hasattr(self, f"enter_{pascal_to_snake(type(node).__name__)}"):
-            getattr(self, f"enter_{pascal_to_snake(type(node).__name__)}")(node)
+        if (handlers := self.get_handlers(type(node))) and handlers[0]:
+            handlers[0](self, node)
 
     def exit_node(self, node: uni.UniNode) -> None:
         """Run on exiting node."""
-        if hasattr(self, f"exit_{pascal_to_snake(type(node).__name__)}"):
-            getattr(self, f"exit_{pascal_to_snake(type(node).__name__)}")(node)
+        if (handlers := self.get_handlers(type(node))) and handlers[1]:
+            handlers[1](self, node)
+
+    def is_unhandled(self, node: uni.UniNode) -> bool:
+        """Check if the pass has no handler for a node or any of its sub nodes."""
+        if not self.skip_unhandled or node.sub_node_tab_stale:
+            return False
+        get_handlers = self.get_handlers
+        if get_handlers(type(node)):
+            return False
+        return not any(get_handlers(typ) for typ in node._sub_node_tab)
 
     def prune(self) -> None:
         """Prune traversal."""
@@ -124,7 +172,7 @@ class UniPass(Transform[uni.Module, uni.Module]):
         self.enter_node(node)
         if not self.prune_signal:
             for i in node.kid:
-                if i:
+                if i and not self.is_unhandled(i):
                     self.traverse(i)
         else:
             self.prune_signal = False
@@ -147,3 +195,108 @@ class PrinterPass(UniPass):
         """Run on exiting node."""
         super().exit_node(node)
         self.log_info(f"Exiting: {node.__class__.__name__}: {node.loc}")
+
+
+class FusedPass(UniPass):
+    """Run several passes in a single traversal of the tree.
+
+    On every node the enter hooks of the passes are called in schedule order,
+    followed by their exit hooks on the way back up. Each pass keeps its own
+    state, prune signal and timing.
+    """
+
+    def __init__(
+        self,
+        ir_in: uni.Module,
+        prog: JacProgram,
+        passes: Sequence[type[UniPass]],
+        cancel_token: Event | None = None,
+    ) -> None:
+        """Initialize fused pass."""
+        self.pass_types = list(passes)
+        self.passes: list[UniPass] = []
+        super().__init__(ir_in, prog, cancel_token=cancel_token)
+
+    @staticmethod
+    def is_fusible(pass_type: type[Transform]) -> bool:
+        """Check if a pass only works through the default traversal."""
+        return (
+            issubclass(pass_type, UniPass)
+            and pass_type.transform is UniPass.transform
+            and pass_type.traverse is UniPass.traverse
+        )
+
+    @staticmethod
+    def group(
+        passes: Sequence[type[Transform[uni.Module, uni.Module]]],
+    ) -> list[list[type[Transform[uni.Module, uni.Module]]]]:
+        """Split a schedule into runs of passes that can share a traversal."""
+        groups: list[list[type[Transform[uni.Module, uni.Module]]]] = []
+        for pass_type in passes:
+            if (
+                groups
+                and FusedPass.is_fusible(groups[-1][0])
+                and FusedPass.is_fusible(pass_type)
+                and (requires := pass_type.requires) is not None  # type: ignore
+                and not any(issubclass(i, requires) for i in groups[-1])
+            ):
+                groups[-1].append(pass_type)
+            else:
+                groups.append([pass_type])
+        return groups
+
+    def transform(self, ir_in: uni.Module) -> uni.Module:
+        """Run the passes."""
+        self.ir_out = ir_in
+        for pass_type in self.pass_types:
+            current = pass_type.__new__(pass_type)
+            current.setup(ir_in, self.prog, cancel_token=self.cancel_token)
+            current.pre_transform()
+            current.ir_out = ir_in
+            self.passes.append(current)
+        for current in self.passes:
+            start_time = time.time()
+            current.before_pass()
+            current.time_taken += time.time() - start_time
+        self.visit(ir_in, self.passes)
+        for current in self.passes:
+            start_time = time.time()
+            current.after_pass()
+            current.time_taken += time.time() - start_time
+            if settings.pass_timer:
+                current.log_time()
+            current.post_transform()
+        return ir_in
+
+    def visit(self, node: uni.UniNode, passes: list[UniPass]) -> None:
+        """Visit a node with the passes that have not skipped it."""
+        if self.is_canceled():
+            return
+        timer = settings.pass_timer
+        descending: list[UniPass] = []
+        for current in passes:
+            current.cur_node = node
+            if timer:
+                start_time = time.time()
+                current.enter_node(node)
+                current.time_taken += time.time() - start_time
+            else:
+                current.enter_node(node)
+            if current.prune_signal:
+                current.prune_signal = False
+            else:
+                descending.append(current)
+        if descending:
+            for i in node.kid:
+                if i and (active := [p for p in descending if not p.is_unhandled(i)]):
+                    self.visit(i, active)
+        if self.is_canceled():
+            return
+        for current in passes:
+            current.cur_node = node
+            if timer:
+                start_time = time.time()
+                current.exit_node(node)
+                current.time_taken += time.time() - start_time
+            else:
+                current.exit_node(node)
@@ -5,10 +5,12 @@ from __future__ import annotations
 import ast as py_ast
 import marshal
 import types
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
 from threading import Event
 from typing import TYPE_CHECKING
 
 import jaclang.compiler.unitree as uni
+from jaclang.compiler.bytecode_cache import BytecodeCache
 from jaclang.compiler.parser import JacParser
 from jaclang.compiler.passes.ecmascript import EsastGenPass
 from jaclang.compiler.passes.main import (
@@ -33,6 +35,7 @@ from jaclang.compiler.passes.tool import (
     DocIRGenPass,
     JacFormatPass,
 )
+from jaclang.compiler.passes.uni_pass import FusedPass
 from jaclang.compiler.ts_parser import TypeScriptParser
 from jaclang.runtimelib.utils import read_file_with_encoding
 from jaclang.settings import settings
@@ -43,8 +46,8 @@ if TYPE_CHECKING:
 ir_gen_sched = [
     SymTabBuildPass,
     DeclImplMatchPass,
-    SemanticAnalysisPass,
     SemDefMatchPass,
+    SemanticAnalysisPass,
     CFGBuildPass,
 ]
 type_check_sched: list = [
@@ -69,6 +72,8 @@ class JacProgram:
         """Initialize the JacProgram object."""
         self.mod: uni.ProgramModule = main_mod if main_mod else uni.ProgramModule()
         self.py_raise_map: dict[str, str] = {}
+        # Modules run from the bytecode cache, compiled once their AST is needed.
+        self.cached_modules: set[str] = set()
         self.errors_had: list[Alert] = []
         self.warnings_had: list[Alert] = []
         self.type_evaluator: TypeEvaluator | None = None
@@ -86,8 +91,43 @@ class JacProgram:
         if full_target in self.mod.hub and self.mod.hub[full_target].gen.py_bytecode:
             codeobj = self.mod.hub[full_target].gen.py_bytecode
             return marshal.loads(codeobj) if isinstance(codeobj, bytes) else None
+        if settings.bytecode_cache and (cached := BytecodeCache.load(full_target)):
+            codeobj, py_raise_map = cached
+            self.py_raise_map.update(py_raise_map)
+            self.cached_modules.add(full_target)
+            return marshal.loads(codeobj)
+        errors, warnings = len(self.errors_had), len(self.warnings_had)
+        raise_map = dict(self.py_raise_map)
         result = self.compile(file_path=full_target)
-        return marshal.loads(result.gen.py_bytecode) if result.gen.py_bytecode else None
+        if not result.gen.py_bytecode:
+            return None
+        # Only clean compiles are cached so diagnostics are never silently lost.
+        if (
+            settings.bytecode_cache
+            and len(self.errors_had) == errors
+            and len(self.warnings_had) == warnings
+        ):
+            BytecodeCache.store(
+                full_target,
+                result.gen.py_bytecode,
+                {
+                    key: value
+                    for key, value in self.py_raise_map.items()
+                    if raise_map.get(key) != value
+                },
+                JacImportDepsPass.import_targets(result),
+            )
+        return marshal.loads(result.gen.py_bytecode)
+
+    def get_module(self, file_path: str) -> uni.Module | None:
+        """Get the module of a file from the hub.
+
+        Modules run from the bytecode cache are compiled into the hub on first
+        use, so the hub holds the same modules as an uncached run.
+        """
+        if file_path not in self.mod.hub and file_path in self.cached_modules:
+            self.compile(file_path)
+        return self.mod.hub.get(file_path)
 
     def parse_str(
         self, source_str: str, file_path: str, cancel_token: Event | None = None
@@ -157,23 +197,72 @@ class JacProgram:
         return mod_targ
 
     def build(
-        self, file_path: str, use_str: str | None = None, type_check: bool = False
+        self,
+        file_path: str,
+        use_str: str | None = None,
+        type_check: bool = False,
+        jobs: int = 1,
     ) -> uni.Module:
-        """Convert a Jac file to an AST."""
+        """Convert a Jac file to an AST.
+
+        With ``jobs`` other than 1 the imported modules are compiled across a
+        process pool first (``jobs=0`` uses every core).
+        """
         mod_targ = self.compile(file_path, use_str, type_check=type_check)
+        if jobs != 1:
+            self.compile_imports(mod_targ, jobs=jobs or None)
         JacImportDepsPass(ir_in=mod_targ, prog=self)
         SemanticAnalysisPass(ir_in=mod_targ, prog=self)
         return mod_targ
 
+    def compile_imports(self, mod: uni.Module, jobs: int | None = None) -> None:
+        """Compile the modules imported by a module across a process pool.
+
+        Every worker compiles one module and reports the modules it imports,
+        which are then queued, so independent modules compile concurrently.
+        The compiled modules are added to the hub, where JacImportDepsPass
+        picks them up instead of compiling them again.
+        """
+        seen: set[str] = set(self.mod.hub)
+        futures: set[Future[CompiledModule]] = set()
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+
+            def submit(targets: list[str]) -> None:
+                for target in targets:
+                    if target not in seen:
+                        seen.add(target)
+                        futures.add(pool.submit(compile_module, target))
+
+            submit(JacImportDepsPass.import_targets(mod))
+            while futures:
+                done, futures = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    hub, imports, py_raise_map, errors, warnings = future.result()
+                    # The hub of the worker also holds the annex modules.
+                    for path, compiled in hub.items():
+                        self.mod.hub.setdefault(path, compiled)
+                    self.py_raise_map.update(py_raise_map)
+                    self.errors_had.extend(errors)
+                    self.warnings_had.extend(warnings)
+                    submit(imports)
+
     def run_schedule(
         self,
         mod: uni.Module,
         passes: list[type[Transform[uni.Module, uni.Module]]],
         cancel_token: Event | None = None,
     ) -> None:
-        """Run the passes on the module."""
-        for current_pass in passes:
-            current_pass(ir_in=mod, prog=self, cancel_token=cancel_token)  # type: ignore
+        """Run the passes on the module, fusing traversals where possible."""
+        for group in FusedPass.group(passes):
+            if len(group) > 1:
+                FusedPass(
+                    ir_in=mod,
+                    prog=self,
+                    passes=group,  # type: ignore
+                    cancel_token=cancel_token,
+                )
+            else:
+                group[0](ir_in=mod, prog=self, cancel_token=cancel_token)  # type: ignore
 
     @staticmethod
     def jac_file_formatter(file_path: str) -> str:
@@ -199,3 +288,36 @@ class JacProgram:
         prse.errors_had = prog.errors_had
         prse.warnings_had = prog.warnings_had
         return prse.ir_out.gen.jac if not prse.errors_had else source_str
+
+
+CompiledModule = tuple[
+    dict[str, uni.Module], list[str], dict[str, str], list[Alert], list[Alert]
+]
+
+
+def compile_module(file_path: str) -> CompiledModule:
+    """Compile a module in a worker process of JacProgram.compile_imports."""
+    prog = JacProgram()
+    mod = prog.compile(
+        file_path, no_cgen=file_path.endswith((".js", ".ts", ".jsx", ".tsx"))
+    )
+    # Store clean compiles in the bytecode cache like JacProgram.get_bytecode.
+    if (
+        settings.bytecode_cache
+        and mod.gen.py_bytecode
+        and not prog.errors_had
+        and not prog.warnings_had
+    ):
+        BytecodeCache.store(
+            file_path,
+            mod.gen.py_bytecode,
+            prog.py_raise_map,
+            JacImportDepsPass.import_targets(mod),
+        )
+    return (
+        prog.mod.hub,
+        JacImportDepsPass.import_targets(mod),
+        prog.py_raise_map,
+        prog.errors_had,
+        prog.warnings_had,
+    )
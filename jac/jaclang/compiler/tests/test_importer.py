@@ -3,9 +3,11 @@
 import io
 import os
 import sys
+import tempfile
 
 from jaclang import JacRuntime as Jac
 from jaclang.cli import cli
+from jaclang.compiler.bytecode_cache import BytecodeCache
 from jaclang.compiler.program import JacProgram
 from jaclang.runtimelib.runtime import JacRuntimeInterface
 from jaclang.settings import settings
@@ -194,3 +196,75 @@ class TestLoader(TestCase):
             )
         finally:
             os.chdir(original_cwd)
+
+    def test_bytecode_cache_reuse_and_invalidation(self) -> None:
+        """Test compiled modules are reused from __jac_cache__ until sources change."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            src = os.path.join(tmp_dir, "cached_mod.jac")
+            impl = os.path.join(tmp_dir, "cached_mod.impl.jac")
+            with open(src, "w") as f:
+                f.write("def greet() -> str;\nglob value = 1;\n")
+            with open(impl, "w") as f:
+                f.write('impl greet() -> str { return "hello"; }\n')
+
+            settings.bytecode_cache = True
+            try:
+                prog = JacProgram()
+                self.assertIsNotNone(prog.get_bytecode(src))
+                self.assertTrue(os.path.isfile(BytecodeCache.cache_path(src)))
+                self.assertIn(src, prog.mod.hub)
+
+                # A fresh program loads from the cache without compiling.
+                prog = JacProgram()
+                self.assertIsNotNone(prog.get_bytecode(src))
+                self.assertNotIn(src, prog.mod.hub)
+                # It still reaches the hub once its AST is needed.
+                self.assertIsNotNone(prog.get_module(src))
+                self.assertIn(src, prog.mod.hub)
+
+                # Editing an annex invalidates the entry.
+                with open(impl, "w") as f:
+                    f.write('impl greet() -> str { return "bye"; }\n')
+                self.assertIsNone(BytecodeCache.load(src))
+                prog = JacProgram()
+                namespace: dict = {}
+                exec(prog.get_bytecode(src), namespace)  # type: ignore[arg-type]
+                self.assertIn(src, prog.mod.hub)
+                self.assertEqual(namespace["greet"](), "bye")
+                self.assertIsNotNone(BytecodeCache.load(src))
+
+                # Adding a new annex file invalidates the entry as well.
+                with open(os.path.join(tmp_dir, "cached_mod.test.jac"), "w") as f:
+                    f.write("test check { assert greet() == 'bye'; }\n")
+                self.assertIsNone(BytecodeCache.load(src))
+            finally:
+                settings.bytecode_cache = False
+
+    def test_bytecode_cache_tracks_imports(self) -> None:
+        """Test editing an imported module invalidates the importer's entry."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            src = os.path.join(tmp_dir, "importer_mod.jac")
+            dep = os.path.join(tmp_dir, "imported_mod.jac")
+            with open(dep, "w") as f:
+                f.write("glob value = 1;\n")
+            with open(src, "w") as f:
+                f.write("import from imported_mod { value }\nglob total = value;\n")
+
+            settings.bytecode_cache = True
+            try:
+                self.assertIsNotNone(JacProgram().get_bytecode(src))
+                self.assertIsNotNone(BytecodeCache.load(src))
+                with open(dep, "w") as f:
+                    f.write("glob value = 2;\n")
+                self.assertIsNone(BytecodeCache.load(src))
+            finally:
+                settings.bytecode_cache = False
+
+    def test_bytecode_cache_disabled(self) -> None:
+        """Test nothing is written when the bytecode cache is off."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            src = os.path.join(tmp_dir, "uncached_mod.jac")
+            with open(src, "w") as f:
+                f.write("glob value = 1;\n")
+            self.assertIsNotNone(JacProgram().get_bytecode(src))
+            self.assertFalse(os.path.exists(BytecodeCache.cache_path(src)))
@@ -81,15 +81,13 @@ class TsLarkParseOutput:
 class TsLarkParseTransform(Transform[TsLarkParseInput, TsLarkParseOutput]):
     """Transform for TypeScript Lark parsing step."""
 
-    comment_cache: list[object] = []
-
     def __init__(self, ir_in: TsLarkParseInput, prog: JacProgram) -> None:
         """Initialize TypeScript Lark parser transform."""
         Transform.__init__(self, ir_in=ir_in, prog=prog)
 
     def transform(self, ir_in: TsLarkParseInput) -> TsLarkParseOutput:
         """Transform input IR by parsing with LALR parser."""
-        TsLarkParseTransform.comment_cache = []
+        self.comments: list[object] = []
         parser = get_ts_parser()
         try:
             tree = parser.parse(ir_in.ir_value, on_error=ir_in.on_error)
@@ -100,7 +98,7 @@ class TsLarkParseTransform(Transform[TsLarkParseInput, TsLarkParseOutput]):
             raise
         return TsLarkParseOutput(
             tree=tree,
-            comments=TsLarkParseTransform.comment_cache.copy(),
+            comments=self.comments,
         )
 
 
@@ -0,0 +1,114 @@
+"""On-disk cache of the typeshed stubs loaded by the type evaluator.
+
+Every TypeEvaluator loads builtins.pyi, typing.pyi and types.pyi and resolves
+the prefetched builtin types from them. The resulting modules, along with the
+types cached on their nodes, are pickled into ``~/.jaclang/stub_cache`` and
+reused as long as the compiler and the stub files are unchanged.
+"""
+
+from __future__ import annotations
+
+import gc
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import contextmanager
+from typing import TypeVar
+
+from jaclang.compiler.bytecode_cache import compiler_fingerprint, file_digest
+from jaclang.settings import settings
+from jaclang.utils.log import logging
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".jaclang", "stub_cache")
+
+T = TypeVar("T")
+
+
+@contextmanager
+def paused_gc() -> Iterator[None]:
+    """Pause the cyclic garbage collector.
+
+    Loading the stubs creates hundreds of thousands of long lived objects and
+    no garbage, so collections triggered meanwhile only cost time.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+class StubCache:
+    """Persistent cache of the loaded stub modules, keyed on their content."""
+
+    @staticmethod
+    def cache_path(stub_paths: Sequence[str]) -> str:
+        """Return the cache file location for a set of stubs."""
+        # One entry per install and interpreter, replaced when it goes stale.
+        digest = hashlib.sha256(
+            "|".join(os.path.abspath(i) for i in stub_paths).encode()
+        ).hexdigest()[:16]
+        tag = sys.implementation.cache_tag or "jac"
+        return os.path.join(CACHE_DIR, f"{digest}.{tag}.pickle")
+
+    @staticmethod
+    def cache_key(stub_paths: Sequence[str]) -> str:
+        """Return the key an entry must match to be valid for this process."""
+        return hashlib.sha256(
+            "|".join(
+                [compiler_fingerprint(), *(file_digest(i) for i in stub_paths)]
+            ).encode()
+        ).hexdigest()
+
+    @staticmethod
+    def load(stub_paths: Sequence[str]) -> object | None:
+        """Return the cached stubs, if valid."""
+        try:
+            with open(StubCache.cache_path(stub_paths), "rb") as f, paused_gc():
+                key, value = pickle.load(f)
+            return value if key == StubCache.cache_key(stub_paths) else None
+        except OSError:
+            return None
+        except Exception as e:
+            # A stale or truncated entry may fail in any way while unpickling.
+            logger.debug(f"Unable to read stub cache: {e}")
+            return None
+
+    @staticmethod
+    def store(stub_paths: Sequence[str], value: object) -> None:
+        """Write the loaded stubs to the cache."""
+        cache_path = StubCache.cache_path(stub_paths)
+        try:
+            entry = (StubCache.cache_key(stub_paths), value)
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            # Write then rename so concurrent processes never see partial entries.
+            fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR)
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, cache_path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except (OSError, pickle.PicklingError, RecursionError) as e:
+            logger.debug(f"Unable to write stub cache: {e}")
+
+    @staticmethod
+    def get(stub_paths: Sequence[str], build: Callable[[], T]) -> T:
+        """Return the cached stubs, building and storing them on a miss."""
+        if not settings.stub_cache:
+            with paused_gc():
+                return build()
+        if (cached := StubCache.load(stub_paths)) is not None:
+            return cached  # type: ignore[return-value]
+        with paused_gc():
+            value = build()
+        StubCache.store(stub_paths, value)
+        return value
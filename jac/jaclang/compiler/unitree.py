@@ -59,6 +59,17 @@ class UniNode:
         self.gen: CodeGenTarget = CodeGenTarget()
         self.loc: CodeLocInfo = CodeLocInfo(*self.resolve_tok_range())
 
+    # Set once the kids of the node or of a node under it change, after which
+    # the sub node table may miss node types that are now in the subtree.
+    sub_node_tab_stale: bool = False
+
+    def mark_sub_node_tab_stale(self) -> None:
+        """Mark the sub node tables of the node and its ancestors as stale."""
+        node: UniNode | None = self
+        while node is not None and not node.sub_node_tab_stale:
+            node.sub_node_tab_stale = True
+            node = node.parent
+
     def construct_sub_node_tab(self) -> None:
         """Construct sub node table."""
         for i in self.kid:
@@ -91,6 +102,7 @@ class UniNode:
     ) -> UniNode:
         """Add kid left."""
         self.kid = [*nodes, *self.kid]
+        self.mark_sub_node_tab_stale()
         if pos_update:
             for i in nodes:
                 i.parent = self
@@ -108,6 +120,7 @@ class UniNode:
     ) -> UniNode:
         """Add kid right."""
         self.kid = [*self.kid, *nodes]
+        self.mark_sub_node_tab_stale()
         if pos_update:
             for i in nodes:
                 i.parent = self
@@ -122,6 +135,7 @@ class UniNode:
     ) -> UniNode:
         """Insert kids at position."""
         self.kid = [*self.kid[:pos], *nodes, *self.kid[pos:]]
+        self.mark_sub_node_tab_stale()
         if pos_update:
             for i in nodes:
                 i.parent = self
@@ -131,6 +145,7 @@ class UniNode:
     def set_kids(self, nodes: Sequence[UniNode]) -> UniNode:
         """Set kids."""
         self.kid = [*nodes]
+        self.mark_sub_node_tab_stale()
         for i in nodes:
             i.parent = self
         self.loc.update_token_range(*self.resolve_tok_range())
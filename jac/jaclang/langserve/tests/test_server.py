@@ -1,3 +1,4 @@
+import os
 from dataclasses import dataclass
 
 import lsprotocol.types as lspt
@@ -39,6 +40,51 @@ class TestJacLangServer(TestCase):
             lsp.get_hover_info(circle_impl_file, pos).contents.value.replace("'", ""),
         )
 
+    def test_reuse_unchanged_check(self) -> None:
+        """Test unchanged files are not rebuilt until a dependency changes."""
+        lsp = self.create_server()
+        circle_path = self.fixture_abs_path("circle_pure.jac")
+        circle_file = uris.from_fs_path(circle_path)
+        circle_impl_file = uris.from_fs_path(
+            self.fixture_abs_path("circle_pure.impl.jac")
+        )
+        lsp.type_check_file(circle_file)
+        build = lsp.get_ir(circle_path)
+        sem_mgr = lsp.sem_managers[circle_path]
+        lsp.type_check_file(circle_file)
+        self.assertIs(build, lsp.get_ir(circle_path))
+        self.assertIs(sem_mgr, lsp.sem_managers[circle_path])
+
+        # Rebuilding an annex also rebuilds the module it belongs to.
+        lsp.type_check_file(circle_impl_file)
+        self.assertIsNot(build, lsp.get_ir(circle_path))
+        self.assertIn(
+            "Circle class inherits from Shape.",
+            lsp.get_hover_info(circle_file, lspt.Position(20, 8)).contents.value,
+        )
+
+        # A dependency changed on disk is reloaded even if the module is not.
+        build = lsp.get_ir(circle_path)
+        impl_path = self.fixture_abs_path("circle_pure.impl.jac")
+        stat = os.stat(impl_path)
+        self.addCleanup(os.utime, impl_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        os.utime(impl_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        lsp.type_check_file(circle_file)
+        self.assertIsNot(build, lsp.get_ir(circle_path))
+
+    def test_debounced_check(self) -> None:
+        """Test a burst of changes only checks the last one."""
+        lsp = self.create_server()
+        circle_file = uris.from_fs_path(self.fixture_abs_path("circle_pure.jac"))
+        checked = []
+        lsp.type_check_file = lambda uri, cancel_token=None: checked.append(
+            cancel_token
+        )
+        for _ in range(3):
+            lsp.type_check(circle_file, delay=0.2)
+        lsp.wait_till_idle_sync()
+        self.assertEqual(checked, [lsp.last_task.cancel_token])
+
     def test_impl_auto_discover(self) -> None:
         """Test that the server doesn't run if there is a syntax error."""
         lsp = self.create_server()
@@ -132,7 +178,7 @@ class TestJacLangServer(TestCase):
             (14, 34, "compiler/type_system/__init__.py:0:0-0:0"),
             (14, 55, "compiler/type_system/types.py:155:0-295:8"),
             (15, 34, "compiler/unitree.py:0:0-0:0"),
-            (15, 48, "compiler/unitree.py:307:0-537:11"),
+            (15, 48, "compiler/unitree.py:322:0-552:11"),
             (17, 22, "langserve/tests/fixtures/circle.jac:8:5-8:8"),
             (18, 38, "vendor/pygls/uris.py:0:0-0:0"),
             (19, 52, "vendor/pygls/server.py:351:0-615:13"),
@@ -2,13 +2,14 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable
+from collections.abc import Callable, Iterable
 from dataclasses import asdict, dataclass, field, fields, is_dataclass
-from enum import IntEnum
-from functools import cached_property
+from datetime import date, time, timedelta
+from decimal import Decimal
+from enum import Enum, IntEnum
+from functools import cached_property, wraps
 from inspect import _empty, signature
 from logging import getLogger
-from pickle import dumps
 from types import UnionType
 from typing import Any, ClassVar, TypeAlias, TypeVar
 from uuid import UUID, uuid4
@@ -21,6 +22,161 @@ TARCH = TypeVar("TARCH", bound="Archetype")
 TANCH = TypeVar("TANCH", bound="Anchor")
 T = TypeVar("T")
 
+# Anchor parts tracked for changes and the anchor attributes that map to them.
+ANCHOR_PARTS = frozenset({"archetype", "edges", "access"})
+TRACKED_ATTRS = {
+    "archetype": "archetype",
+    "root": "archetype",
+    "persistent": "archetype",
+    "edges": "edges",
+    "access": "access",
+}
+# Field values that cannot change in place.
+IMMUTABLE_TYPES = (
+    str,
+    int,
+    float,
+    bool,
+    bytes,
+    complex,
+    UUID,
+    Enum,
+    date,
+    time,
+    timedelta,
+    Decimal,
+    type(None),
+)
+
+
+def tracking(method: Callable[..., T]) -> Callable[..., T]:
+    """Wrap a container method to mark the owning anchor dirty after it runs."""
+
+    @wraps(method)
+    def tracked(
+        self: TrackedList | TrackedDict | TrackedSet, *args: object, **kwargs: object
+    ) -> T:
+        result = method(self, *args, **kwargs)
+        if self.anchor is not None:
+            self.anchor.dirty.add("archetype")
+        return result
+
+    return tracked
+
+
+class TrackedList(list[Any]):
+    """List field value that marks its anchor dirty when changed in place."""
+
+    __slots__ = ("anchor",)
+
+    def __init__(self, items: Iterable[Any] = (), anchor: Anchor | None = None) -> None:
+        """Initialize list owned by anchor."""
+        super().__init__(items)
+        self.anchor = anchor
+
+    def __reduce__(self) -> tuple[type, tuple[list[Any]]]:
+        """Pickle and copy as a plain list."""
+        return list, (list(self),)
+
+
+class TrackedDict(dict[Any, Any]):
+    """Dict field value that marks its anchor dirty when changed in place."""
+
+    __slots__ = ("anchor",)
+
+    def __init__(self, items: Iterable[Any] = (), anchor: Anchor | None = None) -> None:
+        """Initialize dict owned by anchor."""
+        super().__init__(items)
+        self.anchor = anchor
+
+    def __reduce__(self) -> tuple[type, tuple[dict[Any, Any]]]:
+        """Pickle and copy as a plain dict."""
+        return dict, (dict(self),)
+
+
+class TrackedSet(set[Any]):
+    """Set field value that marks its anchor dirty when changed in place."""
+
+    __slots__ = ("anchor",)
+
+    def __init__(self, items: Iterable[Any] = (), anchor: Anchor | None = None) -> None:
+        """Initialize set owned by anchor."""
+        super().__init__(items)
+        self.anchor = anchor
+
+    def __reduce__(self) -> tuple[type, tuple[set[Any]]]:
+        """Pickle and copy as a plain set."""
+        return set, (set(self),)
+
+    def __repr__(self) -> str:
+        """Represent as a plain set."""
+        return repr(set(self))
+
+
+for _cls, _methods in (
+    (
+        TrackedList,
+        "__setitem__ __delitem__ __iadd__ __imul__ append extend insert pop remove "
+        "clear sort reverse",
+    ),
+    (
+        TrackedDict,
+        "__setitem__ __delitem__ __ior__ pop popitem clear update setdefault",
+    ),
+    (
+        TrackedSet,
+        "__ior__ __iand__ __isub__ __ixor__ add discard remove pop clear update "
+        "difference_update intersection_update symmetric_difference_update",
+    ),
+):
+    for _name in _methods.split():
+        setattr(_cls, _name, tracking(getattr(_cls.__mro__[1], _name)))
+
+TRACKED_TYPES: dict[type, type[TrackedList | TrackedDict | TrackedSet]] = {
+    list: TrackedList,
+    dict: TrackedDict,
+    set: TrackedSet,
+}
+
+
+def track(value: Any, anchor: Anchor, swap: bool) -> tuple[Any, bool]:  # noqa: ANN401
+    """Track in-place changes of a field value for its anchor.
+
+    With `swap` set, plain lists, dicts and sets are replaced by tracked copies.
+    That is only safe while nothing else refers to them, e.g. right after
+    loading. Returns the value to keep and whether all its changes are seen.
+    """
+    if isinstance(value, IMMUTABLE_TYPES):
+        return value, True
+    kind = type(value)
+    if kind is frozenset:
+        return value, all(track(item, anchor, False)[1] for item in value)
+    if kind is tuple:
+        items = [track(item, anchor, swap) for item in value]
+        if swap:
+            value = tuple(item for item, _ in items)
+        return value, all(watched for _, watched in items)
+    if swap and (tracked := TRACKED_TYPES.get(kind)):
+        value = tracked(value, anchor)
+    elif kind not in TRACKED_TYPES.values() or value.anchor is not anchor:
+        # Plain containers may be referenced elsewhere and stay unwatched.
+        return value, False
+
+    watched = True
+    if isinstance(value, TrackedDict):
+        for key, item in value.items():
+            item, seen = track(item, anchor, swap)
+            dict.__setitem__(value, key, item)
+            watched &= seen
+    elif isinstance(value, TrackedList):
+        for i, item in enumerate(value):
+            item, seen = track(item, anchor, swap)
+            list.__setitem__(value, i, item)
+            watched &= seen
+    elif isinstance(value, TrackedSet):
+        watched = all(track(item, anchor, False)[1] for item in value)
+    return value, watched
+
 
 class AccessLevel(IntEnum):
     """Access level enum."""
@@ -81,6 +237,7 @@ class ObjectSpatialDestination:
     direction: EdgeDir
     edge: Callable[[Archetype], bool] | None = None
     node: Callable[[Archetype], bool] | None = None
+    edge_type: type | UnionType | None = None
 
     def edge_filter(self, arch: Archetype) -> bool:
         """Filter edge."""
@@ -120,6 +277,8 @@ class ObjectSpatialPath:
         """Convert filter."""
         if not filter:
             return None
+        if isinstance(filter, (type, UnionType)):
+            return lambda i: isinstance(i, filter)
         if callable(filter):
             return filter
         elif isinstance(filter, list):
@@ -134,7 +293,12 @@ class ObjectSpatialPath:
     ) -> ObjectSpatialPath:
         """Append destination."""
         self.destinations.append(
-            ObjectSpatialDestination(direction, self.convert(edge), self.convert(node))
+            ObjectSpatialDestination(
+                direction,
+                self.convert(edge),
+                self.convert(node),
+                edge if isinstance(edge, (type, UnionType)) else None,
+            )
         )
         return self
 
@@ -203,6 +367,53 @@ class Anchor:
         """Check if state."""
         return "archetype" in self.__dict__
 
+    @property
+    def dirty(self) -> set[str]:
+        """Get parts changed since the anchor was loaded or last committed."""
+        if (dirty := self.__dict__.get("_dirty")) is None:
+            # Anchors not loaded from a datasource have never been written.
+            dirty = self.__dict__["_dirty"] = set(ANCHOR_PARTS)
+        return dirty
+
+    def __setattr__(self, name: str, value: object) -> None:
+        """Track writes to persisted parts of the anchor."""
+        super().__setattr__(name, value)
+        if part := TRACKED_ATTRS.get(name):
+            self.dirty.add(part)
+
+    def watch(self, swap: bool = False) -> None:
+        """Track in-place changes of the archetype fields.
+
+        With `swap` set, e.g. right after loading, list, dict and set fields are
+        replaced by tracked copies. Anchors holding values whose changes cannot
+        be seen are treated as changed on every commit.
+        """
+        state = self.archetype.__dict__
+        watched = True
+        for name, value in state.items():
+            if name != "__jac__":
+                value, seen = track(value, self, swap)
+                state[name] = value
+                watched &= seen
+        self.__dict__["_watched"] = watched
+
+    def changes(self) -> set[str]:
+        """Get parts that need to be written on commit.
+
+        Writes through attributes, tracked containers (e.g. appending to a list
+        field) and runtime edge/access operations are tracked without
+        serializing the anchor.
+        """
+        dirty = self.dirty
+        if not dirty and not self.__dict__.get("_watched"):
+            dirty.add("archetype")
+        return dirty
+
+    def mark_clean(self) -> None:
+        """Reset change tracking after the anchor is committed."""
+        self.dirty.clear()
+        self.watch()
+
     def make_stub(self: TANCH) -> TANCH:
         """Return unsynced copy of anchor."""
         if self.is_populated():
@@ -211,6 +422,16 @@ class Anchor:
             return unloaded
         return self
 
+    def unload(self) -> None:
+        """Drop loaded state in place, turning the anchor back into a stub.
+
+        Copies populated from this anchor share its state and are unloaded too.
+        """
+        state = self.__dict__
+        id = self.id
+        state.clear()
+        state["id"] = id
+
     def populate(self) -> None:
         """Retrieve the Archetype from db and return."""
         from jaclang.runtimelib.runtime import JacRuntimeInterface as Jac
@@ -218,7 +439,23 @@ class Anchor:
         jsrc = Jac.get_context().mem
 
         if anchor := jsrc.find_by_id(self.id):
-            self.__dict__.update(anchor.__dict__)
+            # Share state so all copies see the same changes and unload together.
+            self.__dict__ = anchor.__dict__
+
+    @staticmethod
+    def populate_many(anchors: Iterable[Anchor]) -> None:
+        """Retrieve the Archetypes of unloaded anchors from db in one batch."""
+        from jaclang.runtimelib.runtime import JacRuntimeInterface as Jac
+
+        stubs: dict[UUID, list[Anchor]] = {}
+        for anchor in anchors:
+            if not anchor.is_populated():
+                stubs.setdefault(anchor.id, []).append(anchor)
+
+        if stubs:
+            for loaded in Jac.get_context().mem.find(list(stubs)):
+                for anchor in stubs.get(loaded.id, []):
+                    anchor.__dict__ = loaded.__dict__
 
     def __getattr__(self, name: str) -> object:
         """Trigger load if detects unloaded state."""
@@ -259,7 +496,14 @@ class Anchor:
 
         if self.is_populated() and self.archetype:
             self.archetype.__jac__ = self
-            self.hash = hash(dumps(self))
+            self.loaded()
+
+    def loaded(self) -> None:
+        """Start tracking changes of an anchor read from a datasource."""
+        # A non-zero hash marks anchors loaded from a datasource.
+        self.hash = hash(self.id) or 1
+        self.__dict__["_dirty"] = set()
+        self.watch(swap=True)
 
     def __repr__(self) -> str:
         """Override representation."""
@@ -304,6 +548,30 @@ class NodeAnchor(Anchor):
     archetype: NodeArchetype
     edges: list[EdgeAnchor]
 
+    @property
+    def edge_index(self) -> EdgeIndex:
+        """Get adjacency index of edges, rebuilt if edges changed outside of it."""
+        index: EdgeIndex | None = self.__dict__.get("_edge_index")
+        if (
+            index is None
+            or index.edges is not self.edges
+            or index.size != len(self.edges)
+        ):
+            index = self.__dict__["_edge_index"] = EdgeIndex(self)
+        return index
+
+    def index_edge(self, edge: EdgeAnchor) -> None:
+        """Add newly attached edge to the adjacency index if already built."""
+        self.dirty.add("edges")
+        if (index := self.__dict__.get("_edge_index")) and index.edges is self.edges:
+            index.add(edge)
+
+    def unindex_edge(self, edge: EdgeAnchor) -> None:
+        """Remove detached edge from the adjacency index if already built."""
+        self.dirty.add("edges")
+        if (index := self.__dict__.get("_edge_index")) and index.edges is self.edges:
+            index.remove(edge)
+
     def __getstate__(self) -> dict[str, object]:
         """Serialize Node Anchor."""
         state = super().__getstate__()
@@ -314,6 +582,73 @@ class NodeAnchor(Anchor):
         return state
 
 
+class EdgeIndex:
+    """Node edges bucketed by direction and edge archetype class."""
+
+    def __init__(self, node: NodeAnchor) -> None:
+        """Build index from node edges."""
+        self.node = node
+        self.edges = node.edges
+        self.size = 0
+        self.seq = 0
+        self.refs: dict[EdgeAnchor, int] = {}
+        self.buckets: dict[EdgeDir, dict[type, dict[EdgeAnchor, int]]] = {
+            EdgeDir.OUT: {},
+            EdgeDir.IN: {},
+        }
+        Anchor.populate_many(node.edges)
+        for edge in node.edges:
+            self.add(edge)
+
+    def add(self, edge: EdgeAnchor) -> None:
+        """Index edge appended to node edges."""
+        self.size += 1
+        if refs := self.refs.get(edge):
+            self.refs[edge] = refs + 1
+            return
+        self.refs[edge] = 1
+        self.seq += 1
+        if (source := edge.source) and (target := edge.target):
+            edge_type = type(edge.archetype)
+            if self.node == source:
+                self.buckets[EdgeDir.OUT].setdefault(edge_type, {})[edge] = self.seq
+            if self.node == target:
+                self.buckets[EdgeDir.IN].setdefault(edge_type, {})[edge] = self.seq
+
+    def remove(self, edge: EdgeAnchor) -> None:
+        """Unindex edge popped from node edges."""
+        if not (refs := self.refs.get(edge)):
+            return
+        self.size -= 1
+        if refs > 1:
+            self.refs[edge] = refs - 1
+            return
+        del self.refs[edge]
+        for buckets in self.buckets.values():
+            for edge_type, bucket in list(buckets.items()):
+                if bucket.pop(edge, None) is not None and not bucket:
+                    del buckets[edge_type]
+
+    def select(
+        self, direction: EdgeDir, edge_type: type | UnionType | None = None
+    ) -> list[EdgeAnchor]:
+        """Get edges matching direction and edge type in node edges order."""
+        matched: list[dict[EdgeAnchor, int]] = [
+            bucket
+            for dir in (
+                (EdgeDir.OUT, EdgeDir.IN) if direction == EdgeDir.ANY else (direction,)
+            )
+            for typ, bucket in self.buckets[dir].items()
+            if not edge_type or issubclass(typ, edge_type)
+        ]
+        if len(matched) == 1:
+            return list(matched[0])
+        ordered: dict[EdgeAnchor, int] = {}
+        for bucket in matched:
+            ordered.update(bucket)
+        return sorted(ordered, key=ordered.__getitem__)
+
+
 @dataclass(eq=False, repr=False, kw_only=True)
 class EdgeAnchor(Anchor):
     """Edge Anchor."""
@@ -376,6 +711,12 @@ class Archetype:
 
             _.make_archetype(cls)
 
+    def __setattr__(self, name: str, value: object) -> None:
+        """Mark the anchor dirty on field writes."""
+        super().__setattr__(name, value)
+        if name != "__jac__" and (anchor := self.__dict__.get("__jac__")) is not None:
+            anchor.dirty.add("archetype")
+
     def __repr__(self) -> str:
         """Override repr for archetype."""
         return f"{self.__class__.__name__}"
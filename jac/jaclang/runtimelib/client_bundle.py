@@ -69,7 +69,7 @@ class ClientBundleBuilder:
         # Get the manifest to determine which files will be included
         from jaclang.runtimelib.runtime import JacRuntime as Jac
 
-        mod = Jac.program.mod.hub.get(str(source_path))
+        mod = Jac.program.get_module(str(source_path))
         manifest = mod.gen.client_manifest if mod else None
 
         # Build list of all files that will be in the bundle for cache signature
@@ -213,7 +213,7 @@ class ClientBundleBuilder:
         # Get manifest from JacProgram first to check for imports
         from jaclang.runtimelib.runtime import JacRuntime as Jac
 
-        mod = Jac.program.mod.hub.get(str(module_path))
+        mod = Jac.program.get_module(str(module_path))
         manifest = mod.gen.client_manifest if mod else None
 
         # Process client imports and track which modules are being bundled
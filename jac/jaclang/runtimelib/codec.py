@@ -0,0 +1,390 @@
+"""Anchor codecs for persisting graph data.
+
+Anchors are pickled by default. The compact codec writes a versioned binary
+record instead, laid out per archetype class: raw 16 byte UUIDs, packed edge id
+arrays and archetype fields in their declared order. Archetype classes are
+stored as `module:qualname` and imported on load, as pickle does. Values
+without a compact encoding are embedded as pickle, and anchors the codec has no
+layout for (e.g. walkers) are stored as plain pickle. Both codecs read either
+format, so a backend can switch codec without migrating existing data.
+"""
+
+from __future__ import annotations
+
+import pickle
+import struct
+import sys
+from dataclasses import fields, is_dataclass
+from functools import reduce
+from importlib import import_module
+from typing import Any, ClassVar
+from uuid import UUID
+
+from .archetype import (
+    AccessLevel,
+    Anchor,
+    Archetype,
+    EdgeAnchor,
+    NodeAnchor,
+    ObjectAnchor,
+    Permission,
+    TrackedDict,
+    TrackedList,
+)
+
+MAGIC = b"JAC"
+VERSION = 1
+
+KINDS: dict[type[Anchor], int] = {NodeAnchor: 1, EdgeAnchor: 2, ObjectAnchor: 3}
+ANCHOR_TYPES = {kind: cls for cls, kind in KINDS.items()}
+
+PERSISTENT = 0x1
+HAS_ROOT = 0x2
+UNDIRECTED = 0x4
+
+DOUBLE = struct.Struct("<d")
+
+
+class UnsupportedValueError(Exception):
+    """Raised when a value has no compact encoding."""
+
+
+class ArchetypeLayout:
+    """Field layout of an archetype class, resolved by module and class name."""
+
+    layouts: ClassVar[dict[type, tuple[str, ...]]] = {}
+    # Class to the name it is stored under, None if it cannot be resolved by name.
+    names: ClassVar[dict[type, str | None]] = {}
+    # Stored name to class.
+    classes: ClassVar[dict[str, type[Archetype]]] = {}
+
+    @staticmethod
+    def field_names(cls: type[Archetype]) -> tuple[str, ...]:
+        """Get declared field names of an archetype class in order."""
+        if (layout := ArchetypeLayout.layouts.get(cls)) is None:
+            layout = ArchetypeLayout.layouts[cls] = (
+                tuple(f.name for f in fields(cls)) if is_dataclass(cls) else ()
+            )
+        return layout
+
+    @staticmethod
+    def invalidate(cls: type[Archetype]) -> None:
+        """Drop cached layouts after an archetype class is (re)defined."""
+        ArchetypeLayout.layouts.pop(cls, None)
+        ArchetypeLayout.names.pop(cls, None)
+        ArchetypeLayout.classes.pop(f"{cls.__module__}:{cls.__qualname__}", None)
+
+    @staticmethod
+    def name_of(cls: type[Archetype]) -> str | None:
+        """Get the `module:qualname` a class is stored under, None if unreachable."""
+        if cls not in ArchetypeLayout.names:
+            ArchetypeLayout.names[cls] = (
+                f"{cls.__module__}:{cls.__qualname__}" if is_live(cls) else None
+            )
+        return ArchetypeLayout.names[cls]
+
+    @staticmethod
+    def resolve(name: str) -> type[Archetype]:
+        """Get the class stored under name, importing its module like unpickling."""
+        if (cls := ArchetypeLayout.classes.get(name)) is None:
+            module, _, qualname = name.partition(":")
+            try:
+                if module not in sys.modules:
+                    import_module(module)
+                found = reduce(getattr, qualname.split("."), sys.modules[module])
+            except (ImportError, KeyError, AttributeError) as e:
+                raise ValueError(f"Unable to resolve archetype {name}!") from e
+            if not (isinstance(found, type) and issubclass(found, Archetype)):
+                raise ValueError(f"Unable to resolve archetype {name}!")
+            cls = ArchetypeLayout.classes[name] = found
+        return cls
+
+
+def is_live(cls: type) -> bool:
+    """Check if class is the one currently bound in its module."""
+    try:
+        return (
+            reduce(getattr, cls.__qualname__.split("."), sys.modules[cls.__module__])
+            is cls
+        )
+    except (KeyError, AttributeError):
+        return False
+
+
+class AnchorCodec:
+    """Pickle anchor codec."""
+
+    name: ClassVar[str] = "pickle"
+
+    def dumps(self, anchor: Anchor) -> bytes:
+        """Serialize anchor."""
+        return pickle.dumps(anchor)
+
+    def loads(self, data: bytes) -> Anchor:
+        """Deserialize anchor written by any codec."""
+        if data[:3] == MAGIC:
+            return CompactReader(data).read_anchor()
+        return pickle.loads(data)
+
+    @staticmethod
+    def get(name: str) -> AnchorCodec:
+        """Get codec by name."""
+        for codec in (AnchorCodec, CompactAnchorCodec):
+            if codec.name == name:
+                return codec()
+        raise ValueError(f"Unknown anchor codec {name}!")
+
+
+class CompactAnchorCodec(AnchorCodec):
+    """Schema aware binary anchor codec."""
+
+    name: ClassVar[str] = "compact"
+
+    def dumps(self, anchor: Anchor) -> bytes:
+        """Serialize anchor, falling back to pickle without a compact layout."""
+        if (
+            type(anchor) in KINDS
+            and anchor.is_populated()
+            and (name := ArchetypeLayout.name_of(type(anchor.archetype)))
+        ):
+            return CompactWriter().write_anchor(anchor, name)
+        return pickle.dumps(anchor)
+
+
+class CompactWriter:
+    """Compact record writer."""
+
+    def __init__(self) -> None:
+        """Initialize buffer."""
+        self.buf = bytearray(MAGIC)
+        self.buf.append(VERSION)
+
+    def write_anchor(self, anchor: Anchor, name: str) -> bytes:
+        """Write anchor record."""
+        buf = self.buf
+        flags = PERSISTENT if anchor.persistent else 0
+        if anchor.root is not None:
+            flags |= HAS_ROOT
+        if isinstance(anchor, EdgeAnchor) and anchor.is_undirected:
+            flags |= UNDIRECTED
+
+        buf.append(KINDS[type(anchor)])
+        buf.append(flags)
+        buf += anchor.id.bytes
+        if anchor.root is not None:
+            buf += anchor.root.bytes
+
+        buf.append(anchor.access.all + 1)
+        self.write_uint(len(anchor.access.roots.anchors))
+        for root, level in anchor.access.roots.anchors.items():
+            self.write_str(root)
+            buf.append(level + 1)
+
+        if isinstance(anchor, NodeAnchor):
+            self.write_uint(len(anchor.edges))
+            buf += b"".join(edge.id.bytes for edge in anchor.edges)
+        elif isinstance(anchor, EdgeAnchor):
+            buf += anchor.source.id.bytes
+            buf += anchor.target.id.bytes
+
+        self.write_archetype(anchor.archetype, name)
+        return bytes(buf)
+
+    def write_archetype(self, archetype: Archetype, name: str) -> None:
+        """Write archetype class name and fields in layout order."""
+        state = archetype.__dict__
+        layout = ArchetypeLayout.field_names(type(archetype))
+        names = [f for f in layout if f in state]
+        names.extend(f for f in state if f not in layout and f != "__jac__")
+
+        self.write_str(name)
+        self.write_uint(len(names))
+        for field_name in names:
+            self.write_str(field_name)
+            mark = len(self.buf)
+            try:
+                self.write_value(state[field_name])
+            except UnsupportedValueError:
+                del self.buf[mark:]
+                self.write_pickle(state[field_name])
+
+    def write_value(self, value: Any) -> None:  # noqa: ANN401
+        """Write tagged value."""
+        buf = self.buf
+        match value:
+            case None:
+                buf += b"N"
+            case bool():
+                buf += b"T" if value else b"F"
+            case _ if type(value) is int:
+                buf += b"I"
+                self.write_uint(value << 1 if value >= 0 else (-value << 1) - 1)
+            case _ if type(value) is float:
+                buf += b"D"
+                buf += DOUBLE.pack(value)
+            case _ if type(value) is str:
+                buf += b"S"
+                self.write_str(value)
+            case _ if type(value) is bytes:
+                buf += b"B"
+                self.write_uint(len(value))
+                buf += value
+            case _ if type(value) is UUID:
+                buf += b"U"
+                buf += value.bytes
+            case _ if type(value) in (list, TrackedList):
+                buf += b"L"
+                self.write_uint(len(value))
+                for item in value:
+                    self.write_value(item)
+            case _ if type(value) in (dict, TrackedDict):
+                buf += b"M"
+                self.write_uint(len(value))
+                for key, item in value.items():
+                    self.write_value(key)
+                    self.write_value(item)
+            case _:
+                raise UnsupportedValueError
+
+    def write_pickle(self, value: Any) -> None:  # noqa: ANN401
+        """Write value as embedded pickle."""
+        data = pickle.dumps(value)
+        self.buf += b"P"
+        self.write_uint(len(data))
+        self.buf += data
+
+    def write_str(self, value: str) -> None:
+        """Write length prefixed utf-8 string."""
+        data = value.encode()
+        self.write_uint(len(data))
+        self.buf += data
+
+    def write_uint(self, value: int) -> None:
+        """Write unsigned varint."""
+        while value > 0x7F:
+            self.buf.append((value & 0x7F) | 0x80)
+            value >>= 7
+        self.buf.append(value)
+
+
+class CompactReader:
+    """Compact record reader."""
+
+    def __init__(self, data: bytes) -> None:
+        """Initialize reader past the header."""
+        if data[3] != VERSION:
+            raise ValueError(f"Unsupported anchor record version {data[3]}!")
+        self.data = memoryview(data)
+        self.pos = 4
+
+    def read_anchor(self) -> Anchor:
+        """Read anchor record."""
+        data = self.data
+        kind, flags = data[self.pos], data[self.pos + 1]
+        self.pos += 2
+        anchor_type = ANCHOR_TYPES[kind]
+
+        state: dict[str, Any] = {"id": self.read_uuid(), "root": None}
+        if flags & HAS_ROOT:
+            state["root"] = self.read_uuid()
+        state["persistent"] = bool(flags & PERSISTENT)
+
+        access = Permission(all=AccessLevel(data[self.pos] - 1))
+        self.pos += 1
+        for _ in range(self.read_uint()):
+            root = self.read_str()
+            access.roots.anchors[root] = AccessLevel(data[self.pos] - 1)
+            self.pos += 1
+        state["access"] = access
+
+        if anchor_type is NodeAnchor:
+            state["edges"] = [
+                stub(EdgeAnchor, self.read_uuid()) for _ in range(self.read_uint())
+            ]
+        elif anchor_type is EdgeAnchor:
+            state["source"] = stub(NodeAnchor, self.read_uuid())
+            state["target"] = stub(NodeAnchor, self.read_uuid())
+            state["is_undirected"] = bool(flags & UNDIRECTED)
+
+        archetype = state["archetype"] = self.read_archetype()
+        anchor = object.__new__(anchor_type)
+        anchor.__dict__.update(state)
+        archetype.__jac__ = anchor
+        anchor.loaded()
+        return anchor
+
+    def read_archetype(self) -> Archetype:
+        """Read archetype without running its initializer, as unpickling does."""
+        archetype = object.__new__(ArchetypeLayout.resolve(self.read_str()))
+        state = archetype.__dict__
+        for _ in range(self.read_uint()):
+            name = self.read_str()
+            state[name] = self.read_value()
+        return archetype
+
+    def read_value(self) -> Any:  # noqa: ANN401
+        """Read tagged value."""
+        tag = self.data[self.pos]
+        self.pos += 1
+        match tag:
+            case 0x4E:  # N
+                return None
+            case 0x54:  # T
+                return True
+            case 0x46:  # F
+                return False
+            case 0x49:  # I
+                value = self.read_uint()
+                return -((value + 1) >> 1) if value & 1 else value >> 1
+            case 0x44:  # D
+                (value,) = DOUBLE.unpack_from(self.data, self.pos)
+                self.pos += DOUBLE.size
+                return value
+            case 0x53:  # S
+                return self.read_str()
+            case 0x42:  # B
+                return bytes(self.read_bytes(self.read_uint()))
+            case 0x55:  # U
+                return self.read_uuid()
+            case 0x4C:  # L
+                return [self.read_value() for _ in range(self.read_uint())]
+            case 0x4D:  # M
+                return {
+                    self.read_value(): self.read_value()
+                    for _ in range(self.read_uint())
+                }
+            case 0x50:  # P
+                return pickle.loads(self.read_bytes(self.read_uint()))
+        raise ValueError(f"Invalid value tag {tag}!")
+
+    def read_bytes(self, size: int) -> memoryview:
+        """Read raw bytes."""
+        value = self.data[self.pos : self.pos + size]
+        self.pos += size
+        return value
+
+    def read_uuid(self) -> UUID:
+        """Read raw 16 byte UUID."""
+        return UUID(bytes=bytes(self.read_bytes(16)))
+
+    def read_str(self) -> str:
+        """Read length prefixed utf-8 string."""
+        return str(self.read_bytes(self.read_uint()), "utf-8")
+
+    def read_uint(self) -> int:
+        """Read unsigned varint."""
+        value = shift = 0
+        while True:
+            byte = self.data[self.pos]
+            self.pos += 1
+            value |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return value
+            shift += 7
+
+
+def stub(anchor_type: type[Anchor], id: UUID) -> Anchor:
+    """Create unloaded anchor reference, like Anchor.make_stub."""
+    anchor = object.__new__(anchor_type)
+    anchor.__dict__["id"] = id
+    return anchor
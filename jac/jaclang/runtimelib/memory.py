@@ -2,24 +2,43 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable, Generator, Iterable
+import os
+from collections import OrderedDict
+from collections.abc import Callable, Generator, Iterable, Iterator
+from contextlib import contextmanager
 from dataclasses import dataclass, field
-from pickle import dumps
+from itertools import islice
 from shelve import Shelf, open
-from typing import Any, Generic, TypeVar, cast
+from threading import Lock, RLock
+from typing import Any, ClassVar, Generic, TypeVar, cast
 from uuid import UUID
 
-from .archetype import TANCH, Anchor, NodeAnchor, Root
+from ..settings import settings
+from .archetype import TANCH, Anchor, Archetype, NodeAnchor, Root
+from .codec import AnchorCodec
 
 ID = TypeVar("ID")
 
+INDEX_VERSION_KEY = "__version__"
+INDEX_VERSION = 4
+
 
 @dataclass
 class Memory(Generic[ID, TANCH]):
     """Generic Memory Handler."""
 
-    __mem__: dict[ID | UUID, TANCH] = field(default_factory=dict)
+    __mem__: OrderedDict[ID | UUID, TANCH] = field(default_factory=OrderedDict)
     __gc__: set[TANCH] = field(default_factory=set)
+    # Most anchors kept loaded, 0 for no limit. Least recently used anchors
+    # beyond it are written back if changed and unloaded back to stubs. Only
+    # memories with a write back to their datasource evict anchors.
+    cache_size: int = 0
+    write_back: Callable[[list[TANCH]], None] | None = None
+    __pinned__: bool = field(default=False, init=False)
+    # Pin counts of anchors kept loaded while code holds their archetypes.
+    __pins__: dict[ID | UUID, int] = field(default_factory=dict, init=False)
+    # Held by views of the memory used from concurrent threads.
+    lock: RLock = field(default_factory=RLock, init=False, repr=False, compare=False)
 
     def close(self) -> None:
         """Close memory handler."""
@@ -36,11 +55,53 @@ class Memory(Generic[ID, TANCH]):
             anchor for anchor in self.__mem__.values() if not filter or filter(anchor)
         )
 
+    @staticmethod
+    def class_name(cls: type) -> str:
+        """Get the `module:qualname` an archetype class is indexed under."""
+        return f"{cls.__module__}:{cls.__qualname__}"
+
+    @staticmethod
+    def type_name(anchor: Anchor) -> str | None:
+        """Get the archetype class name an anchor is indexed under."""
+        if anchor.is_populated():
+            return Memory.class_name(type(anchor.archetype))
+        return None
+
+    @staticmethod
+    def type_names(archetype: type[Archetype]) -> set[str]:
+        """Get the class names indexed for an archetype and its subclasses."""
+        names: set[str] = set()
+        pending: list[type] = [archetype]
+        while pending:
+            cls = pending.pop()
+            names.add(Memory.class_name(cls))
+            pending.extend(cls.__subclasses__())
+        return names
+
+    def find_by_type(
+        self,
+        archetype: type[Archetype],
+        filter: Callable[[TANCH], bool] | None = None,
+    ) -> Generator[TANCH]:
+        """Find anchors of an archetype class or its subclasses with filter."""
+        return self.query(
+            lambda anchor: isinstance(anchor.archetype, archetype)
+            and (not filter or filter(anchor))
+        )
+
     def all_root(self) -> Generator[Root]:
         """Get all the roots."""
-        for anchor in self.query(lambda anchor: isinstance(anchor.archetype, Root)):
+        for anchor in self.find_by_type(Root):
             yield cast(Root, anchor.archetype)
 
+    def owned_ids(self, root: UUID) -> list[UUID]:
+        """Get the ids of the anchors owned by a root."""
+        return [
+            cast(UUID, anchor.id)
+            for anchor in self.__mem__.values()
+            if anchor.root == root
+        ]
+
     def find(
         self,
         ids: ID | Iterable[ID],
@@ -53,7 +114,7 @@ class Memory(Generic[ID, TANCH]):
         return (
             anchor
             for id in ids
-            if (anchor := self.__mem__.get(id)) and (not filter or filter(anchor))
+            if (anchor := self.find_by_id(id)) and (not filter or filter(anchor))
         )
 
     def find_one(
@@ -66,11 +127,84 @@ class Memory(Generic[ID, TANCH]):
 
     def find_by_id(self, id: ID) -> TANCH | None:
         """Find one by id."""
-        return self.__mem__.get(id)
+        if anchor := self.__mem__.get(id):
+            self.__mem__.move_to_end(id)
+        return anchor
 
     def set(self, data: TANCH) -> None:
         """Save anchor to memory."""
         self.__mem__[data.id] = data
+        self.__mem__.move_to_end(data.id)
+        if self.cache_size and len(self.__mem__) > self.cache_size:
+            self.evict()
+
+    def is_evictable(self, anchor: TANCH) -> bool:
+        """Check if anchor can be reloaded and is not pinned.
+
+        Code holding an archetype across walker visits must pin its anchor,
+        otherwise it would miss changes made through the reloaded copy.
+        """
+        return (
+            anchor.persistent
+            and anchor.id not in self.__pins__
+            # Nodes left without edges are only discarded once committed.
+            and not (
+                isinstance(anchor, NodeAnchor)
+                and not anchor.edges
+                and not isinstance(anchor.archetype, Root)
+            )
+        )
+
+    @contextmanager
+    def pinned(self) -> Iterator[None]:
+        """Keep loaded anchors from being evicted, e.g. while writing them."""
+        pinned, self.__pinned__ = self.__pinned__, True
+        try:
+            yield
+        finally:
+            self.__pinned__ = pinned
+
+    @contextmanager
+    def pinning(self, *anchors: TANCH) -> Iterator[None]:
+        """Keep anchors loaded while in use, e.g. a walker and the node it visits."""
+        self.pin(anchors)
+        try:
+            yield
+        finally:
+            self.unpin(anchors)
+
+    def pin(self, anchors: Iterable[TANCH]) -> None:
+        """Keep anchors loaded until they are unpinned as many times."""
+        pins = self.__pins__
+        for anchor in anchors:
+            pins[anchor.id] = pins.get(anchor.id, 0) + 1
+
+    def unpin(self, anchors: Iterable[TANCH]) -> None:
+        """Release anchors pinned before."""
+        pins = self.__pins__
+        for anchor in anchors:
+            if count := pins[anchor.id] - 1:
+                pins[anchor.id] = count
+            else:
+                del pins[anchor.id]
+
+    def evict(self) -> None:
+        """Unload least recently used anchors beyond the cache size."""
+        if not self.cache_size or self.write_back is None or self.__pinned__:
+            return
+        with self.pinned():
+            excess = len(self.__mem__) - self.cache_size
+            anchors = list(islice(self.__mem__.values(), max(excess, 0)))
+            evictable = [anchor for anchor in anchors if self.is_evictable(anchor)]
+            if changed := [anchor for anchor in evictable if anchor.changes()]:
+                self.write_back(changed)
+            for anchor in anchors:
+                if anchor in evictable and not anchor.dirty:
+                    self.__mem__.pop(anchor.id, None)
+                    anchor.unload()
+                elif anchor.id in self.__mem__:
+                    # Still in use, check again once the rest has aged.
+                    self.__mem__.move_to_end(anchor.id)
 
     def remove(self, ids: ID | Iterable[ID]) -> None:
         """Remove anchor/s from memory."""
@@ -78,16 +212,33 @@ class Memory(Generic[ID, TANCH]):
             ids = [ids]
 
         for id in ids:
-            if anchor := self.__mem__.pop(id, None):
+            # Anchors evicted from the cache are loaded back to be collected.
+            if anchor := self.find_by_id(id):
+                self.__mem__.pop(id, None)
                 self.__gc__.add(anchor)
 
     def commit(self, anchor: TANCH | None = None) -> None:
         """Commit all data from memory to datasource."""
 
+    def commit_changes(
+        self, anchors: Iterable[TANCH], removed: Iterable[TANCH]
+    ) -> None:
+        """Commit some anchors and removals, leaving other changes pending."""
+        for anchor in removed:
+            self.__mem__.pop(anchor.id, None)
+            self.__gc__.add(anchor)
+            self.commit(anchor)
+        for anchor in anchors:
+            self.commit(anchor)
+
     def get_gc(self) -> list:
         """Commit all data from memory to datasource."""
         return list(self.__gc__)
 
+    def in_gc(self, anchor: TANCH) -> bool:
+        """Check if anchor is removed and waiting for commit."""
+        return anchor in self.__gc__
+
     def remove_from_gc(self, anchor: TANCH) -> None:
         """Commit all data from memory to datasource."""
         self.__gc__.remove(anchor)
@@ -101,99 +252,339 @@ class Memory(Generic[ID, TANCH]):
         self.__mem__.pop(anchor)
 
 
+@dataclass
+class SessionShelves:
+    """Shelves of a session, opened once per process.
+
+    Every storage of the session shares them and holds the lock around each
+    shelf access, so storages may be used from concurrent threads.
+    """
+
+    path: str
+    shelf: Shelf[bytes | Anchor]
+    # Ids of the stored anchors by archetype class and by owning root, kept in
+    # a shelf of its own so the session shelf only ever holds anchors.
+    index: Shelf[Any]
+    lock: RLock = field(default_factory=RLock)
+    users: int = 0
+
+    opened: ClassVar[dict[str, SessionShelves]] = {}
+    opened_lock: ClassVar[Lock] = Lock()
+
+    @staticmethod
+    def acquire(session: str) -> SessionShelves:
+        """Get the shelves of a session, opening them for its first user."""
+        path = os.path.abspath(session)
+        with SessionShelves.opened_lock:
+            if (shelves := SessionShelves.opened.get(path)) is None:
+                shelves = SessionShelves.opened[path] = SessionShelves(
+                    path,
+                    open(session),  # noqa: SIM115
+                    open(f"{session}.index"),  # noqa: SIM115
+                )
+            shelves.users += 1
+            return shelves
+
+    def release(self) -> None:
+        """Stop using the shelves, closing them after their last user."""
+        with SessionShelves.opened_lock:
+            self.users -= 1
+            if self.users:
+                return
+            del SessionShelves.opened[self.path]
+            with self.lock:
+                self.shelf.close()
+                self.index.close()
+
+
 @dataclass
 class ShelfStorage(Memory[UUID, Anchor]):
     """Shelf Handler."""
 
-    __shelf__: Shelf[Anchor] | None = None
+    __shelf__: Shelf[bytes | Anchor] | None = None
+    __index__: Shelf[Any] | None = None
 
-    def __init__(self, session: str | None = None) -> None:
-        """Initialize memory handler."""
-        super().__init__()
-        self.__shelf__ = open(session) if session else None  # noqa: SIM115
+    def __init__(
+        self, session: str | None = None, codec: AnchorCodec | None = None
+    ) -> None:
+        """Initialize memory handler.
+
+        Storages of the same session share its shelves but each keeps its own
+        loaded anchors.
+        """
+        super().__init__(
+            cache_size=settings.anchor_cache_size if session else 0,
+            write_back=self.sync_anchors,
+        )
+        self.shelves = SessionShelves.acquire(session) if session else None
+        self.__shelf__ = self.shelves.shelf if self.shelves else None
+        self.__index__ = self.shelves.index if self.shelves else None
+        self.lock = self.shelves.lock if self.shelves else RLock()
+        # Ids to add to and remove from each index key, not written yet.
+        self.__indexed__: dict[str, set[str]] = {}
+        self.__unindexed__: dict[str, set[str]] = {}
+        self.codec = codec or AnchorCodec.get(settings.anchor_codec)
+
+    @staticmethod
+    def index_keys(anchor: Anchor) -> list[str]:
+        """Get the index keys listing an anchor, its archetype and owner root.
+
+        Each key holds the set of ids listed under it, so a query only reads
+        the keys of the classes or root it asks for.
+        """
+        if not (name := Memory.type_name(anchor)):
+            return []
+        if anchor.root:
+            return [f"type:{name}", f"root:{anchor.root.hex}"]
+        return [f"type:{name}"]
+
+    def list_ids(
+        self, id: str, listed: Iterable[str] = (), unlisted: Iterable[str] = ()
+    ) -> None:
+        """Queue an id to be added to and removed from index keys."""
+        for key in listed:
+            self.__indexed__.setdefault(key, set()).add(id)
+            self.__unindexed__.get(key, set()).discard(id)
+        for key in unlisted:
+            self.__unindexed__.setdefault(key, set()).add(id)
+            self.__indexed__.get(key, set()).discard(id)
+
+    def load(self, id: str) -> Anchor | None:
+        """Load anchor from shelf, including entries stored as pickled anchors."""
+        if not isinstance(self.__shelf__, Shelf):
+            return None
+        with self.lock:
+            data = self.__shelf__.get(id)
+        if isinstance(data, bytes):
+            return self.codec.loads(data)
+        return data
+
+    def dump(self, anchor: Anchor, indexed: Iterable[str] = ()) -> None:
+        """Write anchor to shelf, updating the index keys it was stored with."""
+        if isinstance(self.__shelf__, Shelf):
+            # Shelf already pickles its values, keep them readable as anchors.
+            self.__shelf__[str(anchor.id)] = (
+                anchor if self.codec.name == "pickle" else self.codec.dumps(anchor)
+            )
+            # Only new anchors or ones moved to another class or root change
+            # the index.
+            keys, indexed = set(self.index_keys(anchor)), set(indexed)
+            self.list_ids(str(anchor.id), keys - indexed, indexed - keys)
+
+    def drop(self, anchor: Anchor) -> None:
+        """Remove anchor from shelf."""
+        if isinstance(self.__shelf__, Shelf):
+            id = str(anchor.id)
+            # Unloaded anchors are unlisted under the keys of their stored copy.
+            keys = self.index_keys(anchor)
+            if not keys and (stored := self.load(id)):
+                keys = self.index_keys(stored)
+            self.__shelf__.pop(id, None)
+            self.list_ids(id, unlisted=keys)
 
     def commit(self, anchor: Anchor | None = None) -> None:
         """Commit all data from memory to datasource."""
         if isinstance(self.__shelf__, Shelf):
-            if anchor:
-                if anchor in self.__gc__:
-                    self.__shelf__.pop(str(anchor.id), None)
-                    self.__mem__.pop(anchor.id, None)
-                    self.__gc__.remove(anchor)
-                else:
-                    self.sync_mem_to_db([anchor.id])
-                return
+            # Syncing loads anchors for access checks, which must not evict
+            # the ones still being written.
+            with self.lock, self.pinned():
+                self._commit(anchor)
+            self.evict()
+
+    def _commit(self, anchor: Anchor | None = None) -> None:
+        """Write the gc and loaded anchors to the shelf."""
+        if anchor:
+            if anchor in self.__gc__:
+                self.drop(anchor)
+                self.__mem__.pop(anchor.id, None)
+                self.__gc__.remove(anchor)
+            else:
+                self.sync_mem_to_db([anchor.id])
+            self.sync_index()
+            return
+
+        for anc in self.__gc__:
+            self.drop(anc)
+            self.__mem__.pop(anc.id, None)
+        self.__gc__.clear()
 
-            for anc in self.__gc__:
-                self.__shelf__.pop(str(anc.id), None)
-                self.__mem__.pop(anc.id, None)
+        keys = set(self.__mem__.keys())
 
-            keys = set(self.__mem__.keys())
+        # current memory
+        self.sync_mem_to_db(keys)
 
-            # current memory
-            self.sync_mem_to_db(keys)
+        # additional after memory sync
+        self.sync_mem_to_db(set(self.__mem__.keys() - keys))
 
-            # additional after memory sync
-            self.sync_mem_to_db(set(self.__mem__.keys() - keys))
+        # flush to disk so long-lived handles stay durable between commits
+        if isinstance(self.__shelf__, Shelf):
+            self.__shelf__.sync()
+        self.sync_index()
+
+    def commit_changes(
+        self, anchors: Iterable[Anchor], removed: Iterable[Anchor]
+    ) -> None:
+        """Write some loaded and removed anchors, leaving other changes pending."""
+        if not isinstance(self.__shelf__, Shelf):
+            return
+        with self.lock, self.pinned():
+            for anchor in removed:
+                self.drop(anchor)
+                self.__mem__.pop(anchor.id, None)
+            self.sync_mem_to_db([anchor.id for anchor in anchors])
+            self.__shelf__.sync()
+            self.sync_index()
+        self.evict()
 
     def close(self) -> None:
         """Close memory handler."""
         self.commit()
 
-        if isinstance(self.__shelf__, Shelf):
-            self.__shelf__.close()
+        if self.shelves:
+            self.shelves.release()
+            self.shelves = self.__shelf__ = self.__index__ = None
 
         super().close()
 
+    def build_index(self) -> None:
+        """Index the anchors of a shelf written before it had an index."""
+        if not (
+            isinstance(self.__shelf__, Shelf)
+            and isinstance(index := self.__index__, Shelf)
+        ):
+            return
+        keys: dict[str, set[str]] = {}
+        for id in self.__shelf__:
+            if anchor := self.load(id):
+                for key in self.index_keys(anchor):
+                    keys.setdefault(key, set()).add(id)
+        index.clear()
+        index.update(keys)
+        index[INDEX_VERSION_KEY] = INDEX_VERSION
+        self.__indexed__.clear()
+        self.__unindexed__.clear()
+
+    def sync_index(self) -> None:
+        """Write pending index changes, rewriting only the keys they touch."""
+        if not isinstance(index := self.__index__, Shelf):
+            return
+        if index.get(INDEX_VERSION_KEY) != INDEX_VERSION:
+            self.build_index()
+        elif self.__indexed__ or self.__unindexed__:
+            for key in self.__indexed__.keys() | self.__unindexed__.keys():
+                ids = (
+                    index.get(key, set()) - self.__unindexed__.get(key, set())
+                ) | self.__indexed__.get(key, set())
+                if ids:
+                    index[key] = ids
+                else:
+                    index.pop(key, None)
+            self.__indexed__.clear()
+            self.__unindexed__.clear()
+        index.sync()
+
+    def indexed_ids(self, keys: Iterable[str]) -> set[str]:
+        """Get the ids listed under any of the index keys."""
+        if not isinstance(index := self.__index__, Shelf):
+            return set()
+        ids: set[str] = set()
+        with self.lock:
+            if index.get(INDEX_VERSION_KEY) != INDEX_VERSION:
+                self.sync_index()
+            for key in keys:
+                ids |= (
+                    index.get(key, set()) - self.__unindexed__.get(key, set())
+                ) | self.__indexed__.get(key, set())
+        return ids
+
+    def owned_ids(self, root: UUID) -> list[UUID]:
+        """Get the ids of the stored anchors owned by a root."""
+        if isinstance(self.__shelf__, Shelf):
+            return [UUID(id) for id in self.indexed_ids([f"root:{root.hex}"])]
+        return super().owned_ids(root)
+
     def sync_mem_to_db(self, keys: Iterable[UUID]) -> None:
         """Manually sync memory to db."""
         from jaclang.runtimelib.runtime import JacRuntimeInterface as Jac
 
         if isinstance(self.__shelf__, Shelf):
             for key in keys:
-                if (
+                if not (
                     (d := self.__mem__.get(key))
                     and d.persistent
-                    and d.hash != hash(dumps(d))
+                    and (dirty := d.changes())
                 ):
-                    _id = str(d.id)
-                    if p_d := self.__shelf__.get(_id):
-                        if (
-                            isinstance(p_d, NodeAnchor)
-                            and isinstance(d, NodeAnchor)
-                            and p_d.edges != d.edges
-                            and Jac.check_connect_access(d)
-                        ):
-                            if not d.edges and not isinstance(d.archetype, Root):
-                                self.__shelf__.pop(_id, None)
-                                continue
-                            p_d.edges = d.edges
-
-                        if Jac.check_write_access(d):
-                            if hash(dumps(p_d.access)) != hash(dumps(d.access)):
-                                p_d.access = d.access
-                            if hash(dumps(p_d.archetype)) != hash(dumps(d.archetype)):
-                                p_d.archetype = d.archetype
-
-                        self.__shelf__[_id] = p_d
-                    elif not (
-                        isinstance(d, NodeAnchor)
-                        and not isinstance(d.archetype, Root)
-                        and not d.edges
+                    continue
+
+                _id = str(d.id)
+                if p_d := self.load(_id):
+                    indexed = self.index_keys(p_d)
+                    if (
+                        "edges" in dirty
+                        and isinstance(p_d, NodeAnchor)
+                        and isinstance(d, NodeAnchor)
+                        and p_d.edges != d.edges
+                        and Jac.check_connect_access(d)
                     ):
-                        self.__shelf__[_id] = d
+                        if not d.edges and not isinstance(d.archetype, Root):
+                            self.drop(d)
+                            d.mark_clean()
+                            continue
+                        p_d.edges = d.edges
+
+                    if Jac.check_write_access(d):
+                        if "access" in dirty:
+                            p_d.access = d.access
+                        if "archetype" in dirty:
+                            p_d.archetype = d.archetype
+
+                    self.dump(p_d, indexed)
+                elif not (
+                    isinstance(d, NodeAnchor)
+                    and not isinstance(d.archetype, Root)
+                    and not d.edges
+                ):
+                    self.dump(d)
+                d.mark_clean()
+
+    def sync_anchors(self, anchors: list[Anchor]) -> None:
+        """Write changed anchors to the shelf."""
+        with self.lock:
+            self.sync_mem_to_db([anchor.id for anchor in anchors])
 
     def query(self, filter: Callable[[Anchor], bool] | None = None) -> Generator[Any]:
         """Find anchors from memory with filter."""
         if isinstance(self.__shelf__, Shelf):
-            for anchor in self.__shelf__.values():
-                if not filter or filter(anchor):
+            with self.lock:
+                ids = list(self.__shelf__)
+            for id in ids:
+                if (anchor := self.load(id)) and (not filter or filter(anchor)):
                     if anchor.id not in self.__mem__:
-                        self.__mem__[anchor.id] = anchor
+                        self.set(anchor)
                     yield anchor
         else:
             yield from super().query(filter)
 
+    def find_by_type(
+        self,
+        archetype: type[Archetype],
+        filter: Callable[[Anchor], bool] | None = None,
+    ) -> Generator[Anchor]:
+        """Find anchors of an archetype class or its subclasses with filter.
+
+        Only the anchors indexed under the class are loaded, one at a time.
+        """
+        if isinstance(self.__shelf__, Shelf):
+            keys = [f"type:{name}" for name in self.type_names(archetype)]
+            for anchor in self.find(UUID(id) for id in self.indexed_ids(keys)):
+                # Entries are re-checked as an anchor may change archetype.
+                if isinstance(anchor.archetype, archetype) and (
+                    not filter or filter(anchor)
+                ):
+                    yield anchor
+        else:
+            yield from super().find_by_type(archetype, filter)
+
     def find(
         self,
         ids: UUID | Iterable[UUID],
@@ -205,14 +596,14 @@ class ShelfStorage(Memory[UUID, Anchor]):
 
         if isinstance(self.__shelf__, Shelf):
             for id in ids:
-                anchor = self.__mem__.get(id)
+                anchor = super().find_by_id(id)
 
                 if (
                     not anchor
                     and id not in self.__gc__
-                    and (_anchor := self.__shelf__.get(str(id)))
+                    and (_anchor := self.load(str(id)))
                 ):
-                    self.__mem__[id] = anchor = _anchor
+                    self.set(anchor := _anchor)
                 if anchor and (not filter or filter(anchor)):
                     yield anchor
         else:
@@ -222,11 +613,101 @@ class ShelfStorage(Memory[UUID, Anchor]):
         """Find one by id."""
         data = super().find_by_id(id)
 
-        if (
-            not data
-            and isinstance(self.__shelf__, Shelf)
-            and (data := self.__shelf__.get(str(id)))
-        ):
-            self.__mem__[id] = data
+        if not data and (data := self.load(str(id))):
+            self.set(data)
 
         return data
+
+
+@dataclass
+class RequestMemory(Memory[UUID, Anchor]):
+    """Memory of one request over a memory shared by concurrent requests.
+
+    Anchors are found in and loaded into the shared memory, so requests reuse
+    each other's loaded anchors. The anchors a request touches are its write
+    buffer. They stay pinned in the shared memory until the request closes,
+    and only they and the anchors it removed are committed.
+    """
+
+    def __init__(self, base: Memory[UUID, Anchor]) -> None:
+        """Initialize a view of the shared memory."""
+        super().__init__()
+        self.base = base
+
+    def _track(self, anchor: Anchor | None) -> Anchor | None:
+        """Add an anchor of the shared memory to the write buffer."""
+        if anchor is None or anchor in self.__gc__:
+            return None
+        if anchor.id not in self.__mem__:
+            self.__mem__[anchor.id] = anchor
+            self.base.pin([anchor])
+        return anchor
+
+    def _shared(self, anchors: Iterator[Anchor]) -> Generator[Anchor]:
+        """Iterate anchors of the shared memory, locking it while each is read."""
+        while True:
+            with self.base.lock:
+                if (anchor := next(anchors, None)) is None:
+                    return
+                anchor = self._track(anchor)
+            if anchor:
+                yield anchor
+
+    def find_by_id(self, id: UUID) -> Anchor | None:
+        """Find one by id, loading it into the shared memory."""
+        if anchor := self.__mem__.get(id):
+            return anchor
+        with self.base.lock:
+            return self._track(self.base.find_by_id(id))
+
+    def find_by_type(
+        self,
+        archetype: type[Archetype],
+        filter: Callable[[Anchor], bool] | None = None,
+    ) -> Generator[Anchor]:
+        """Find anchors of an archetype class or its subclasses with filter."""
+        return self._shared(iter(self.base.find_by_type(archetype, filter)))
+
+    def owned_ids(self, root: UUID) -> list[UUID]:
+        """Get the ids of the stored anchors owned by a root."""
+        with self.base.lock:
+            return self.base.owned_ids(root)
+
+    def set(self, data: Anchor) -> None:
+        """Save anchor to the shared memory and the write buffer."""
+        with self.base.lock:
+            self.base.set(data)
+            self._track(data)
+
+    def pin(self, anchors: Iterable[Anchor]) -> None:
+        """Keep anchors loaded in the shared memory."""
+        with self.base.lock:
+            self.base.pin(anchors)
+
+    def unpin(self, anchors: Iterable[Anchor]) -> None:
+        """Release anchors pinned in the shared memory."""
+        with self.base.lock:
+            self.base.unpin(anchors)
+
+    def commit(self, anchor: Anchor | None = None) -> None:
+        """Commit the write buffer, or one anchor of it, to the shared memory."""
+        with self.base.lock:
+            if anchor in self.__gc__:
+                self.__gc__.remove(anchor)
+                self.base.commit_changes([], [anchor])
+                self.base.unpin([anchor])
+            elif anchor:
+                self.base.commit_changes([anchor], [])
+            else:
+                removed = list(self.__gc__)
+                self.__gc__.clear()
+                self.base.commit_changes(list(self.__mem__.values()), removed)
+                self.base.unpin(removed)
+
+    def close(self) -> None:
+        """Commit the write buffer and release its anchors."""
+        self.commit()
+        with self.base.lock:
+            self.base.unpin(self.__mem__.values())
+            self.base.evict()
+        super().close()
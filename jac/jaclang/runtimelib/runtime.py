@@ -8,10 +8,13 @@ import inspect
 import os
 import sys
 import tempfile
+import threading
 import types
 from collections import OrderedDict
 from collections.abc import Callable, Coroutine, Mapping, Sequence
 from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import ContextVar, Token, copy_context
+from copy import copy
 from dataclasses import MISSING, dataclass, field
 from functools import wraps
 from http.server import BaseHTTPRequestHandler
@@ -21,6 +24,7 @@ from pathlib import Path
 from typing import (
     TYPE_CHECKING,
     Any,
+    ClassVar,
     Literal,
     ParamSpec,
     TypeAlias,
@@ -29,6 +33,7 @@ from typing import (
     get_type_hints,
 )
 from uuid import UUID
+from weakref import WeakKeyDictionary
 
 import pluggy
 
@@ -47,6 +52,7 @@ from jaclang.runtimelib.archetype import (
     Root as _Root,
 )
 from jaclang.runtimelib.client_bundle import ClientBundle, ClientBundleBuilder
+from jaclang.runtimelib.codec import ArchetypeLayout
 from jaclang.runtimelib.constructs import (
     AccessLevel,
     Anchor,
@@ -61,12 +67,13 @@ from jaclang.runtimelib.constructs import (
     WalkerAnchor,
     WalkerArchetype,
 )
-from jaclang.runtimelib.memory import Memory, Shelf, ShelfStorage
+from jaclang.runtimelib.memory import Memory, RequestMemory, ShelfStorage
 from jaclang.runtimelib.mtp import MTIR
 from jaclang.runtimelib.utils import (
     all_issubclass,
     traverse_graph,
 )
+from jaclang.settings import settings
 from jaclang.utils import infer_language
 
 if TYPE_CHECKING:
@@ -120,6 +127,21 @@ class ExecutionContext:
             self._get_anchor(entry_node) if entry_node else self.root_state
         )
 
+    def view(self, root: str | None = None) -> ExecutionContext:
+        """Get a context on a root sharing this one's memory, with its own writes."""
+        ctx = copy(self)
+        ctx.mem = RequestMemory(self.mem)
+        ctx.reports = []
+        ctx.custom = MISSING
+        ctx.system_root = cast(
+            NodeAnchor,
+            ctx.mem.find_by_id(UUID(Con.SUPER_ROOT_UUID)) or self.system_root,
+        )
+        ctx.entry_node = ctx.root_state = (
+            ctx._get_anchor(root) if root else ctx.system_root
+        )
+        return ctx
+
     def close(self) -> None:
         """Close current ExecutionContext."""
         self.mem.close()
@@ -151,6 +173,7 @@ class JacAccessValidation:
         _root_id = str(root_id)
         if level != access.anchors.get(_root_id, AccessLevel.NO_ACCESS):
             access.anchors[_root_id] = level
+            archetype.__jac__.dirty.add("access")
 
     @staticmethod
     def disallow_root(
@@ -162,7 +185,8 @@ class JacAccessValidation:
         level = AccessLevel.cast(level)
         access = archetype.__jac__.access.roots
 
-        access.anchors.pop(str(root_id), None)
+        if access.anchors.pop(str(root_id), None) is not None:
+            archetype.__jac__.dirty.add("access")
 
     @staticmethod
     def perm_grant(
@@ -173,6 +197,7 @@ class JacAccessValidation:
         level = AccessLevel.cast(level)
         if level != anchor.access.all:
             anchor.access.all = level
+            anchor.dirty.add("access")
 
     @staticmethod
     def perm_revoke(archetype: Archetype) -> None:
@@ -180,6 +205,7 @@ class JacAccessValidation:
         anchor = archetype.__jac__
         if anchor.access.all > AccessLevel.NO_ACCESS:
             anchor.access.all = AccessLevel.NO_ACCESS
+            anchor.dirty.add("access")
 
     @staticmethod
     def check_read_access(to: Anchor) -> bool:
@@ -265,18 +291,112 @@ class JacAccessValidation:
         return access_level
 
 
+@dataclass(eq=False)
+class WalkerDispatch:
+    """Abilities triggered when a walker type visits a location type, in call order."""
+
+    walker_entry: list[Callable[[Any, Any], Any]]
+    loc: list[Callable[[Any, Any], Any]]
+    walker_exit: list[Callable[[Any, Any], Any]]
+
+    # Walker class -> location class (NoneType for walker-only plans) -> plan.
+    # Weak keys let classes of reloaded or discarded modules be collected.
+    plans: ClassVar[
+        WeakKeyDictionary[type, WeakKeyDictionary[type, WalkerDispatch]]
+    ] = WeakKeyDictionary()
+
+    @staticmethod
+    def get(warch: WalkerArchetype, loc: Archetype | None) -> WalkerDispatch:
+        """Get cached dispatch plan, building it on first visit of the pair."""
+        if (by_loc := WalkerDispatch.plans.get(warch.__class__)) is None:
+            by_loc = WalkerDispatch.plans[warch.__class__] = WeakKeyDictionary()
+        if (plan := by_loc.get(loc.__class__)) is None:
+            plan = by_loc[loc.__class__] = WalkerDispatch.build(warch, loc)
+        return plan
+
+    @staticmethod
+    def build(warch: WalkerArchetype, loc: Archetype | None) -> WalkerDispatch:
+        """Resolve ability triggers for a walker and location pair."""
+        if loc is None:
+            return WalkerDispatch(
+                walker_entry=[i.func for i in warch._jac_entry_funcs_ if not i.trigger],
+                loc=[],
+                walker_exit=[i.func for i in warch._jac_exit_funcs_ if not i.trigger],
+            )
+
+        def on_loc(i: ObjectSpatialFunction) -> bool:
+            return bool(
+                i.trigger
+                and (
+                    all_issubclass(i.trigger, NodeArchetype)
+                    or all_issubclass(i.trigger, EdgeArchetype)
+                )
+                and isinstance(loc, i.trigger)
+            )
+
+        def on_walker(i: ObjectSpatialFunction) -> bool:
+            return bool(
+                i.trigger
+                and all_issubclass(i.trigger, WalkerArchetype)
+                and isinstance(warch, i.trigger)
+            )
+
+        return WalkerDispatch(
+            walker_entry=[i.func for i in warch._jac_entry_funcs_ if on_loc(i)],
+            loc=[
+                *(i.func for i in loc._jac_entry_funcs_ if not i.trigger),
+                *(i.func for i in loc._jac_entry_funcs_ if on_walker(i)),
+                *(i.func for i in loc._jac_exit_funcs_ if on_walker(i)),
+                *(i.func for i in loc._jac_exit_funcs_ if not i.trigger),
+            ],
+            walker_exit=[i.func for i in warch._jac_exit_funcs_ if on_loc(i)],
+        )
+
+    @staticmethod
+    def invalidate(cls: type) -> None:
+        """Drop plans involving a (re-)registered archetype class or a subclass.
+
+        Subclasses inherit the abilities of ``cls`` so their plans are stale too.
+        """
+        for walker, by_loc in list(WalkerDispatch.plans.items()):
+            if issubclass(walker, cls):
+                del WalkerDispatch.plans[walker]
+                continue
+            for loc in [loc for loc in by_loc if issubclass(loc, cls)]:
+                del by_loc[loc]
+
+
 class JacNode:
     """Jac Node Operations."""
 
+    @staticmethod
+    def _select_edges(
+        origin: list[NodeArchetype], destination: ObjectSpatialDestination
+    ) -> list[tuple[NodeAnchor, list[EdgeAnchor]]]:
+        """Select edges of each origin node, loading their nodes in one batch."""
+        selected = [
+            (
+                nanch := node.__jac__,
+                nanch.edge_index.select(destination.direction, destination.edge_type),
+            )
+            for node in origin
+        ]
+        Anchor.populate_many(
+            node
+            for _, edges in selected
+            for edge in edges
+            for node in (edge.source, edge.target)
+        )
+        return selected
+
     @staticmethod
     def get_edges(
         origin: list[NodeArchetype], destination: ObjectSpatialDestination
     ) -> list[EdgeArchetype]:
         """Get edges connected to this node."""
         edges: OrderedDict[EdgeAnchor, EdgeArchetype] = OrderedDict()
-        for node in origin:
-            nanch = node.__jac__
-            for anchor in nanch.edges:
+        for nanch, selected in JacNode._select_edges(origin, destination):
+            for anchor in selected:
                 if (
                     (source := anchor.source)
                     and (target := anchor.target)
@@ -310,9 +430,8 @@ class JacNode:
         loc: OrderedDict[NodeAnchor | EdgeAnchor, NodeArchetype | EdgeArchetype] = (
             OrderedDict()
         )
-        for node in origin:
-            nanch = node.__jac__
-            for anchor in nanch.edges:
+        for nanch, selected in JacNode._select_edges(origin, destination):
+            for anchor in selected:
                 if (
                     (source := anchor.source)
                     and (target := anchor.target)
@@ -344,9 +463,8 @@ class JacNode:
     ) -> list[NodeArchetype]:
         """Get set of nodes connected to this node."""
         nodes: OrderedDict[NodeAnchor, NodeArchetype] = OrderedDict()
-        for node in origin:
-            nanch = node.__jac__
-            for anchor in nanch.edges:
+        for nanch, selected in JacNode._select_edges(origin, destination):
+            for anchor in selected:
                 if (
                     (source := anchor.source)
                     and (target := anchor.target)
@@ -376,6 +494,7 @@ class JacNode:
         for idx, ed in enumerate(node.edges):
             if ed.id == edge.id:
                 node.edges.pop(idx)
+                node.unindex_edge(ed)
                 break
 
 
@@ -422,6 +541,7 @@ class JacWalker:
                 insert_loc = 0
             elif insert_loc < 0:
                 insert_loc += len(wanch.next) + 1
+            Anchor.populate_many(next)
             wanch.next = wanch.next[:insert_loc] + next + wanch.next[insert_loc:]
             return len(wanch.next) > before_len
         else:
@@ -433,91 +553,53 @@ class JacWalker:
         node: NodeAnchor | EdgeAnchor,
     ) -> WalkerArchetype:
         """Jac's spawn operator feature."""
-        warch = walker.archetype
-        walker.path = []
-        current_loc = node.archetype
-
-        # walker ability on any entry
-        for i in warch._jac_entry_funcs_:
-            if not i.trigger:
-                i.func(warch, current_loc)
-            if walker.disengaged:
-                return warch
-
-        while len(walker.next):
-            if current_loc := walker.next.pop(0).archetype:
-                # walker ability with loc entry
-                for i in warch._jac_entry_funcs_:
-                    if (
-                        i.trigger
-                        and (
-                            all_issubclass(i.trigger, NodeArchetype)
-                            or all_issubclass(i.trigger, EdgeArchetype)
-                        )
-                        and isinstance(current_loc, i.trigger)
-                    ):
-                        i.func(warch, current_loc)
-                    if walker.disengaged:
-                        return warch
-
-                # loc ability with any entry
-                for i in current_loc._jac_entry_funcs_:
-                    if not i.trigger:
-                        i.func(current_loc, warch)
-                    if walker.disengaged:
-                        return warch
-
-                # loc ability with walker entry
-                for i in current_loc._jac_entry_funcs_:
-                    if (
-                        i.trigger
-                        and all_issubclass(i.trigger, WalkerArchetype)
-                        and isinstance(warch, i.trigger)
-                    ):
-                        i.func(current_loc, warch)
-                    if walker.disengaged:
-                        return warch
-
-                # loc ability with walker exit
-                for i in current_loc._jac_exit_funcs_:
-                    if (
-                        i.trigger
-                        and all_issubclass(i.trigger, WalkerArchetype)
-                        and isinstance(warch, i.trigger)
-                    ):
-                        i.func(current_loc, warch)
-                    if walker.disengaged:
-                        return warch
-
-                # loc ability with any exit
-                for i in current_loc._jac_exit_funcs_:
-                    if not i.trigger:
-                        i.func(current_loc, warch)
-                    if walker.disengaged:
-                        return warch
-
-                # walker ability with loc exit
-                for i in warch._jac_exit_funcs_:
-                    if (
-                        i.trigger
-                        and (
-                            all_issubclass(i.trigger, NodeArchetype)
-                            or all_issubclass(i.trigger, EdgeArchetype)
-                        )
-                        and isinstance(current_loc, i.trigger)
-                    ):
-                        i.func(warch, current_loc)
+        # The walker and the location being visited stay loaded while in use.
+        mem = JacRuntimeInterface.get_context().mem
+        with mem.pinning(walker, node):
+            warch = walker.archetype
+            walker.path = []
+            current_loc = node.archetype
+
+            # walker ability on any entry
+            plan = WalkerDispatch.get(warch, None)
+            for func in plan.walker_entry:
+                func(warch, current_loc)
+                if walker.disengaged:
+                    return warch
+
+            while len(walker.next):
+                loc = walker.next.pop(0)
+                with mem.pinning(loc):
+                    if current_loc := loc.archetype:
+                        loc_plan = WalkerDispatch.get(warch, current_loc)
+
+                        # walker ability with loc entry
+                        for func in loc_plan.walker_entry:
+                            func(warch, current_loc)
+                            if walker.disengaged:
+                                return warch
+
+                        # loc ability with any/walker entry, then walker/any exit
+                        for func in loc_plan.loc:
+                            func(current_loc, warch)
+                            if walker.disengaged:
+                                return warch
+
+                        # walker ability with loc exit
+                        for func in loc_plan.walker_exit:
+                            func(warch, current_loc)
+                            if walker.disengaged:
+                                return warch
+
+            # walker ability with any exit, still at the last location
+            with mem.pinning(current_loc.__jac__):
+                for func in plan.walker_exit:
+                    func(warch, current_loc)
                     if walker.disengaged:
                         return warch
-        # walker ability with any exit
-        for i in warch._jac_exit_funcs_:
-            if not i.trigger:
-                i.func(warch, current_loc)
-            if walker.disengaged:
-                return warch
 
-        walker.ignores = []
-        return warch
+            walker.ignores = []
+            return warch
 
     @staticmethod
     async def async_spawn_call(
@@ -525,107 +607,63 @@ class JacWalker:
         node: NodeAnchor | EdgeAnchor,
     ) -> WalkerArchetype:
         """Jac's spawn operator feature."""
-        warch = walker.archetype
-        walker.path = []
-        current_loc = node.archetype
-
-        # walker ability on any entry
-        for i in warch._jac_entry_funcs_:
-            if not i.trigger:
-                result = i.func(warch, current_loc)
+        # The walker and the location being visited stay loaded while in use.
+        mem = JacRuntimeInterface.get_context().mem
+        with mem.pinning(walker, node):
+            warch = walker.archetype
+            walker.path = []
+            current_loc = node.archetype
+
+            # walker ability on any entry
+            plan = WalkerDispatch.get(warch, None)
+            for func in plan.walker_entry:
+                result = func(warch, current_loc)
                 if isinstance(result, Coroutine):
                     await result
-            if walker.disengaged:
-                return warch
-
-        while len(walker.next):
-            if current_loc := walker.next.pop(0).archetype:
-                # walker ability with loc entry
-                for i in warch._jac_entry_funcs_:
-                    if (
-                        i.trigger
-                        and (
-                            all_issubclass(i.trigger, NodeArchetype)
-                            or all_issubclass(i.trigger, EdgeArchetype)
-                        )
-                        and isinstance(current_loc, i.trigger)
-                    ):
-                        result = i.func(warch, current_loc)
-                        if isinstance(result, Coroutine):
-                            await result
-                    if walker.disengaged:
-                        return warch
-
-                # loc ability with any entry
-                for i in current_loc._jac_entry_funcs_:
-                    if not i.trigger:
-                        result = i.func(current_loc, warch)
-                        if isinstance(result, Coroutine):
-                            await result
-                    if walker.disengaged:
-                        return warch
-
-                # loc ability with walker entry
-                for i in current_loc._jac_entry_funcs_:
-                    if (
-                        i.trigger
-                        and all_issubclass(i.trigger, WalkerArchetype)
-                        and isinstance(warch, i.trigger)
-                    ):
-                        result = i.func(current_loc, warch)
-                        if isinstance(result, Coroutine):
-                            await result
-                    if walker.disengaged:
-                        return warch
-
-                # loc ability with walker exit
-                for i in current_loc._jac_exit_funcs_:
-                    if (
-                        i.trigger
-                        and all_issubclass(i.trigger, WalkerArchetype)
-                        and isinstance(warch, i.trigger)
-                    ):
-                        result = i.func(current_loc, warch)
-                        if isinstance(result, Coroutine):
-                            await result
-                    if walker.disengaged:
-                        return warch
-
-                # loc ability with any exit
-                for i in current_loc._jac_exit_funcs_:
-                    if not i.trigger:
-                        result = i.func(current_loc, warch)
-                        if isinstance(result, Coroutine):
-                            await result
+                if walker.disengaged:
+                    return warch
+
+            while len(walker.next):
+                loc = walker.next.pop(0)
+                with mem.pinning(loc):
+                    if current_loc := loc.archetype:
+                        loc_plan = WalkerDispatch.get(warch, current_loc)
+
+                        # walker ability with loc entry
+                        for func in loc_plan.walker_entry:
+                            result = func(warch, current_loc)
+                            if isinstance(result, Coroutine):
+                                await result
+                            if walker.disengaged:
+                                return warch
+
+                        # loc ability with any/walker entry, then walker/any exit
+                        for func in loc_plan.loc:
+                            result = func(current_loc, warch)
+                            if isinstance(result, Coroutine):
+                                await result
+                            if walker.disengaged:
+                                return warch
+
+                        # walker ability with loc exit
+                        for func in loc_plan.walker_exit:
+                            result = func(warch, current_loc)
+                            if isinstance(result, Coroutine):
+                                await result
+                            if walker.disengaged:
+                                return warch
+
+            # walker ability with any exit, still at the last location
+            with mem.pinning(current_loc.__jac__):
+                for func in plan.walker_exit:
+                    result = func(warch, current_loc)
+                    if isinstance(result, Coroutine):
+                        await result
                     if walker.disengaged:
                         return warch
 
-                # walker ability with loc exit
-                for i in warch._jac_exit_funcs_:
-                    if (
-                        i.trigger
-                        and (
-                            all_issubclass(i.trigger, NodeArchetype)
-                            or all_issubclass(i.trigger, EdgeArchetype)
-                        )
-                        and isinstance(current_loc, i.trigger)
-                    ):
-                        result = i.func(warch, current_loc)
-                        if isinstance(result, Coroutine):
-                            await result
-                    if walker.disengaged:
-                        return warch
-        # walker ability with any exit
-        for i in warch._jac_exit_funcs_:
-            if not i.trigger:
-                result = i.func(warch, current_loc)
-                if isinstance(result, Coroutine):
-                    await result
-            if walker.disengaged:
-                return warch
-
-        walker.ignores = []
-        return warch
+            walker.ignores = []
+            return warch
 
     @staticmethod
     def spawn(
@@ -816,6 +854,8 @@ class JacBasics:
     @staticmethod
     def get_context() -> ExecutionContext:
         """Get current execution context."""
+        if (ctx := JacRuntime.exec_ctx_var.get()) is not None:
+            return ctx
         if JacRuntime.exec_ctx is None:
             JacRuntime.exec_ctx = JacRuntimeInterface.create_j_context()
         return JacRuntime.exec_ctx
@@ -831,23 +871,29 @@ class JacBasics:
 
     @staticmethod
     def reset_graph(root: Root | None = None) -> int:
-        """Purge current or target graph."""
+        """Purge current or target graph, returning the number of anchors removed.
+
+        Only the anchors owned by the root are loaded, a batch at a time, and
+        each batch is committed before the next one is loaded. Like commit(),
+        this also writes any other change pending in the current context.
+        """
         ctx = JacRuntimeInterface.get_context()
-        mem = cast(ShelfStorage, ctx.mem)
+        mem = ctx.mem
         ranchor = root.__jac__ if root else ctx.root_state
+        batch_size = max(settings.purge_batch_size, 1)
 
+        ids = [id for id in mem.owned_ids(ranchor.id) if id != ranchor.id]
         deleted_count = 0
-        for anchor in (
-            anchors.values()
-            if isinstance(anchors := mem.__shelf__, Shelf)
-            else mem.__mem__.values()
-        ):
-            if anchor == ranchor or anchor.root != ranchor.id:
-                continue
-
-            if loaded_anchor := mem.find_by_id(anchor.id):
-                deleted_count += 1
-                JacRuntimeInterface.destroy([loaded_anchor])
+        for i in range(0, len(ids), batch_size):
+            pending = set(mem.get_gc())
+            for anchor in mem.find(ids[i : i + batch_size]):
+                # Ownership entries are re-checked as an anchor may change root.
+                if anchor.root == ranchor.id and not mem.in_gc(anchor):
+                    JacRuntimeInterface.destroy([anchor])
+            # Count what was destroyed, including edges removed with their nodes,
+            # but not anchors that were missing or could not be written.
+            deleted_count += len(set(mem.get_gc()) - pending)
+            mem.commit()
 
         return deleted_count
 
@@ -888,6 +934,8 @@ class JacBasics:
 
         cls._jac_entry_funcs_ = [*entries.values()]
         cls._jac_exit_funcs_ = [*exits.values()]
+        WalkerDispatch.invalidate(cls)
+        ArchetypeLayout.invalidate(cls)
 
         dataclass(eq=False)(cls)
         return cls
@@ -1371,6 +1419,8 @@ class JacBasics:
             )
             source.edges.append(eanch)
             target.edges.append(eanch)
+            source.index_edge(eanch)
+            target.index_edge(eanch)
 
             if conn_assign:
                 for fld, val in zip(conn_assign[0], conn_assign[1], strict=False):
@@ -1564,25 +1614,41 @@ class JacByLLM:
         # Generate and return a random value matching the return type
         return random_value_for_type(return_type)
 
+    @staticmethod
+    async def acall_llm(model: object, mtir: MTIR) -> Any:  # noqa: ANN401
+        """Call the LLM model from async code."""
+        return JacRuntimeInterface.call_llm(model, mtir)
+
     @staticmethod
     def by(model: object) -> Callable:
         """Python library mode decorator for Jac's by llm() syntax."""
 
         def _decorator(caller: Callable) -> Callable:
-            def _wrapped_caller(*args: object, **kwargs: object) -> object:
+            def _get_mtir(args: tuple, kwargs: dict[str, object]) -> MTIR:
                 invoke_args: dict[int | str, object] = {}
                 for i, arg in enumerate(args):
                     invoke_args[i] = arg
                 for key, value in kwargs.items():
                     invoke_args[key] = value
-                mtir = JacRuntime.get_mtir(
+                return JacRuntime.get_mtir(
                     caller=caller,
                     args=invoke_args,
                     call_params=(
                         model.call_params if hasattr(model, "call_params") else {}
                     ),
                 )
-                return JacRuntime.call_llm(model, mtir)
+
+            if inspect.iscoroutinefunction(caller):
+
+                async def _async_wrapped_caller(
+                    *args: object, **kwargs: object
+                ) -> object:
+                    return await JacRuntime.acall_llm(model, _get_mtir(args, kwargs))
+
+                return _async_wrapped_caller
+
+            def _wrapped_caller(*args: object, **kwargs: object) -> object:
+                return JacRuntime.call_llm(model, _get_mtir(args, kwargs))
 
             return _wrapped_caller
 
@@ -1800,7 +1866,8 @@ class JacUtils:
     def thread_run(func: Callable, *args: object) -> Future:  # noqa: ANN401
         """Run a function in a thread."""
         _executor = JacRuntime.pool
-        return _executor.submit(func, *args)
+        # Run in a copy of the caller's context so the thread shares its exec_ctx.
+        return _executor.submit(copy_context().run, func, *args)
 
     @staticmethod
     def thread_wait(future: Any) -> None:  # noqa: ANN401
@@ -1942,7 +2009,11 @@ class JacRuntime(JacRuntimeInterface):
     base_path_dir: str = os.getcwd()
     program: JacProgram = JacProgram()
     pool: ThreadPoolExecutor = ThreadPoolExecutor()
+    # Process-wide context, used by threads and tasks that did not set their own.
     exec_ctx: ExecutionContext | None = None
+    exec_ctx_var: ContextVar[ExecutionContext | None] = ContextVar(
+        "jac_exec_ctx", default=None
+    )
 
     @staticmethod
     def set_base_path(base_path: str) -> None:
@@ -1952,9 +2023,21 @@ class JacRuntime(JacRuntimeInterface):
         )
 
     @staticmethod
-    def set_context(context: ExecutionContext) -> None:
-        """Set the context for the machine."""
-        JacRuntime.exec_ctx = context
+    def set_context(context: ExecutionContext) -> Token[ExecutionContext | None]:
+        """Set the context for the current thread or asyncio task.
+
+        Pooled threads outlive a single execution, so the returned token must be
+        passed to `reset_context` once the execution is done.
+        """
+        token = JacRuntime.exec_ctx_var.set(context)
+        if threading.current_thread() is threading.main_thread():
+            JacRuntime.exec_ctx = context
+        return token
+
+    @staticmethod
+    def reset_context(token: Token[ExecutionContext | None]) -> None:
+        """Restore the context the current thread had before `set_context`."""
+        JacRuntime.exec_ctx_var.reset(token)
 
     @staticmethod
     def reset_machine() -> None:
@@ -1966,9 +2049,11 @@ class JacRuntime(JacRuntimeInterface):
             if i.__name__ not in special_modules:
                 sys.modules.pop(i.__name__, None)
         JacRuntime.loaded_modules.clear()
+        WalkerDispatch.plans.clear()
         JacRuntime.base_path_dir = os.getcwd()
         JacRuntime.program = JacProgram()
         JacRuntime.pool = ThreadPoolExecutor()
-        if JacRuntime.exec_ctx is not None:
-            JacRuntime.exec_ctx.mem.close()
+        if (ctx := JacRuntime.exec_ctx_var.get() or JacRuntime.exec_ctx) is not None:
+            ctx.mem.close()
         JacRuntime.exec_ctx = JacRuntimeInterface.create_j_context()
+        JacRuntime.exec_ctx_var.set(JacRuntime.exec_ctx)
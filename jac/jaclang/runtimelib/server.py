@@ -8,13 +8,18 @@ import inspect
 import json
 import os
 import secrets
-from collections.abc import Callable
-from contextlib import suppress
+import socket
+from collections.abc import Callable, Generator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, suppress
 from dataclasses import dataclass, field
 from http.server import BaseHTTPRequestHandler, HTTPServer
+from io import BufferedReader
 from pathlib import Path
-from typing import Any, Literal, TypeAlias, get_type_hints
+from threading import BoundedSemaphore, Lock, RLock
+from typing import Any, Literal, TypeAlias, cast, get_type_hints
 from urllib.parse import parse_qs, urlparse
+from weakref import WeakValueDictionary
 
 from jaclang.runtimelib.client_bundle import ClientBundleError
 from jaclang.runtimelib.constructs import (
@@ -23,13 +28,14 @@ from jaclang.runtimelib.constructs import (
     Root,
     WalkerArchetype,
 )
+from jaclang.runtimelib.runtime import ExecutionContext
 from jaclang.runtimelib.runtime import JacRuntime as Jac
 
 # Type Aliases
 JsonValue: TypeAlias = (
     None | str | int | float | bool | list["JsonValue"] | dict[str, "JsonValue"]
 )
-StatusCode: TypeAlias = Literal[200, 201, 400, 401, 404, 500, 503]
+StatusCode: TypeAlias = Literal[200, 201, 400, 401, 404, 500, 503, 504]
 
 
 # Response Models
@@ -103,6 +109,56 @@ class JacSerializer:
         return result
 
 
+# Session Pool
+class SessionPool:
+    """Session memory kept open across the requests of a session.
+
+    A long-lived context holds the session storage and its anchor cache. Each
+    request runs on a view of that context with its own root, reports and
+    write buffer, and commits its buffer once when it finishes. Requests on
+    the same root run one at a time, requests on different roots run
+    concurrently.
+    """
+
+    def __init__(self, session_path: str) -> None:
+        """Initialize session pool."""
+        self.session_path = session_path
+        self.lock = Lock()
+        self._ctx: ExecutionContext | None = None
+        # Locks of the roots with requests running, dropped after the last one.
+        self._roots: WeakValueDictionary[str | None, RLock] = WeakValueDictionary()
+
+    @contextmanager
+    def request(
+        self, root: str | None = None
+    ) -> Generator[ExecutionContext, None, None]:
+        """Run a request on a root of the session."""
+        with self.lock:
+            if self._ctx is None:
+                self._ctx = Jac.create_j_context(session=self.session_path)
+            base = self._ctx
+            if (lock := self._roots.get(root)) is None:
+                lock = self._roots[root] = RLock()
+
+        with lock:
+            ctx = base.view(root)
+            token = Jac.set_context(ctx)
+            try:
+                yield ctx
+            finally:
+                try:
+                    ctx.mem.close()
+                finally:
+                    Jac.reset_context(token)
+
+    def close(self) -> None:
+        """Close the storage kept open for the session."""
+        with self.lock:
+            if self._ctx is not None:
+                self._ctx.mem.close()
+                self._ctx = None
+
+
 # User Management
 @dataclass(slots=True)
 class UserManager:
@@ -112,10 +168,13 @@ class UserManager:
     _users: dict[str, dict[str, str]] = field(default_factory=dict, init=False)
     _tokens: dict[str, str] = field(default_factory=dict, init=False)
     _db_path: str = field(init=False)
+    sessions: SessionPool = field(init=False)
+    _lock: Lock = field(default_factory=Lock, init=False)
 
     def __post_init__(self) -> None:
         """Initialize user database."""
         self._db_path = f"{self.session_path}.users.json"
+        self.sessions = SessionPool(self.session_path)
         self._load_db()
 
     def _load_db(self) -> None:
@@ -137,32 +196,26 @@ class UserManager:
 
     def create_user(self, username: str, password: str) -> dict[str, str]:
         """Create a new user with their own root node. Returns dict with user data or error."""
-        if username in self._users:
-            return {"error": "User already exists"}
-
-        ctx = Jac.create_j_context(session=self.session_path)
-        Jac.set_context(ctx)
-
-        try:
-            user_root = Root()
-            root_anchor = user_root.__jac__
-            Jac.save(root_anchor)
-            Jac.commit(root_anchor)
-            root_id = root_anchor.id.hex
-        finally:
-            ctx.mem.close()
-            Jac.set_context(Jac.create_j_context())
-
-        token = secrets.token_urlsafe(32)
-        password_hash = hashlib.sha256(password.encode()).hexdigest()
-
-        self._users[username] = {
-            "password_hash": password_hash,
-            "token": token,
-            "root_id": root_id,
-        }
-        self._tokens[token] = username
-        self._persist()
+        with self._lock:
+            if username in self._users:
+                return {"error": "User already exists"}
+
+            with self.sessions.request():
+                user_root = Root()
+                root_anchor = user_root.__jac__
+                Jac.save(root_anchor)
+                root_id = root_anchor.id.hex
+
+            token = secrets.token_urlsafe(32)
+            password_hash = hashlib.sha256(password.encode()).hexdigest()
+
+            self._users[username] = {
+                "password_hash": password_hash,
+                "token": token,
+                "root_id": root_id,
+            }
+            self._tokens[token] = username
+            self._persist()
 
         return {"username": username, "token": token, "root_id": root_id}
 
@@ -193,16 +246,45 @@ class UserManager:
     def close(self) -> None:
         """Close and persist user data."""
         self._persist()
+        self.sessions.close()
 
 
 # Execution Context Manager
 class ExecutionManager:
-    """Manages execution contexts for user operations."""
+    """Manages execution contexts for user operations.
 
-    def __init__(self, session_path: str, user_manager: UserManager) -> None:
+    With a timeout, operations run on a pool of `workers` threads and callers
+    stop waiting once it expires, raising TimeoutError. Python threads cannot
+    be interrupted, so a timed out operation keeps its pool thread until it
+    returns.
+    """
+
+    def __init__(
+        self,
+        session_path: str,
+        user_manager: UserManager,
+        workers: int = 8,
+        timeout: float | None = None,
+    ) -> None:
         """Initialize execution manager."""
         self.session_path = session_path
         self.user_manager = user_manager
+        self.timeout = timeout
+        self.pool = ThreadPoolExecutor(
+            max_workers=max(1, workers), thread_name_prefix="jac-exec"
+        )
+
+    def _run(
+        self, operation: Callable[[], dict[str, JsonValue]]
+    ) -> dict[str, JsonValue]:
+        """Run an operation, raising TimeoutError if it outlives the timeout."""
+        if self.timeout is None:
+            return operation()
+        return self.pool.submit(operation).result(self.timeout)
+
+    def close(self) -> None:
+        """Stop accepting operations on the pool."""
+        self.pool.shutdown(wait=False, cancel_futures=True)
 
     def execute_function(
         self, func: Callable[..., Any], args: dict[str, Any], username: str
@@ -212,21 +294,18 @@ class ExecutionManager:
         if not root_id:
             return {"error": "User not found"}
 
-        ctx = Jac.create_j_context(session=self.session_path, root=root_id)
-        Jac.set_context(ctx)
+        def execute() -> dict[str, JsonValue]:
+            try:
+                with self.user_manager.sessions.request(root_id) as ctx:
+                    result = func(**args)
+                    return {
+                        "result": JacSerializer.serialize(result),
+                        "reports": JacSerializer.serialize(ctx.reports),
+                    }
+            except Exception as e:
+                return {"error": str(e)}
 
-        try:
-            result = func(**args)
-            Jac.commit()
-            return {
-                "result": JacSerializer.serialize(result),
-                "reports": JacSerializer.serialize(ctx.reports),
-            }
-        except Exception as e:
-            return {"error": str(e)}
-        finally:
-            ctx.mem.close()
-            Jac.set_context(Jac.create_j_context())
+        return self._run(execute)
 
     def spawn_walker(
         self, walker_cls: type[WalkerArchetype], fields: dict[str, Any], username: str
@@ -237,33 +316,31 @@ class ExecutionManager:
             return {"error": "User not found"}
 
         target_node_id = fields.pop("_jac_spawn_node", None)
-        ctx = Jac.create_j_context(session=self.session_path, root=root_id)
-        Jac.set_context(ctx)
 
-        try:
-            walker = walker_cls(**fields)
+        def spawn() -> dict[str, JsonValue]:
+            try:
+                with self.user_manager.sessions.request(root_id) as ctx:
+                    walker = walker_cls(**fields)
 
-            if target_node_id:
-                target_node = Jac.get_object(target_node_id)
-                if not isinstance(target_node, NodeArchetype):
-                    return {"error": f"Invalid target node: {target_node_id}"}
-            else:
-                target_node = ctx.get_root()
+                    if target_node_id:
+                        target_node = Jac.get_object(target_node_id)
+                        if not isinstance(target_node, NodeArchetype):
+                            return {"error": f"Invalid target node: {target_node_id}"}
+                    else:
+                        target_node = ctx.get_root()
 
-            Jac.spawn(walker, target_node)
-            # Jac.commit()
+                    Jac.spawn(walker, target_node)
 
-            return {
-                "result": JacSerializer.serialize(walker),
-                "reports": JacSerializer.serialize(ctx.reports),
-            }
-        except Exception as e:
-            import traceback
+                    return {
+                        "result": JacSerializer.serialize(walker),
+                        "reports": JacSerializer.serialize(ctx.reports),
+                    }
+            except Exception as e:
+                import traceback
 
-            return {"error": str(e), "traceback": traceback.format_exc()}
-        finally:
-            ctx.mem.close()
-            Jac.set_context(Jac.create_j_context())
+                return {"error": str(e), "traceback": traceback.format_exc()}
+
+        return self._run(spawn)
 
 
 # Module Introspector
@@ -322,7 +399,7 @@ class ModuleIntrospector:
 
         mod_path = getattr(self._module, "__file__", None)
         if mod_path:
-            mod = Jac.program.mod.hub.get(mod_path)
+            mod = Jac.program.get_module(mod_path)
             if mod and mod.gen.client_manifest:
                 manifest = mod.gen.client_manifest
                 self._client_manifest = {
@@ -349,7 +426,7 @@ class ModuleIntrospector:
         if not mod_path:
             return
 
-        mod_ast = Jac.program.mod.hub.get(mod_path)
+        mod_ast = Jac.program.get_module(mod_path)
         if not mod_ast:
             return
 
@@ -616,11 +693,13 @@ class ResponseBuilder:
         handler: BaseHTTPRequestHandler, status: StatusCode, data: dict[str, JsonValue]
     ) -> None:
         """Send JSON response with CORS headers."""
+        payload = json.dumps(data).encode()
         handler.send_response(status)
         handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(payload)))
         ResponseBuilder._add_cors_headers(handler)
         handler.end_headers()
-        handler.wfile.write(json.dumps(data).encode())
+        handler.wfile.write(payload)
 
     @staticmethod
     def send_html(
@@ -760,9 +839,12 @@ class ExecutionHandler(RouteHandler):
         if name not in functions:
             return Response(404, {"error": f"Function '{name}' not found"})
 
-        result = self.execution_manager.execute_function(
-            functions[name], args, username
-        )
+        try:
+            result = self.execution_manager.execute_function(
+                functions[name], args, username
+            )
+        except TimeoutError:
+            return Response(504, {"error": f"Function '{name}' timed out"})
         return Response(200, result)
 
     def spawn_walker(
@@ -775,10 +857,81 @@ class ExecutionHandler(RouteHandler):
         if name not in walkers:
             return Response(404, {"error": f"Walker '{name}' not found"})
 
-        result = self.execution_manager.spawn_walker(walkers[name], fields, username)
+        try:
+            result = self.execution_manager.spawn_walker(
+                walkers[name], fields, username
+            )
+        except TimeoutError:
+            return Response(504, {"error": f"Walker '{name}' timed out"})
         return Response(200, result)
 
 
+# HTTP Server
+class JacHTTPServer(HTTPServer):
+    """HTTP server handling connections on a bounded pool of worker threads.
+
+    At most `workers` connections are served at once and `queue_size` more may
+    wait for a worker. Connections beyond that are rejected with a 503. A
+    kept-alive connection holds its worker until the handler drops it for
+    being idle.
+    """
+
+    REJECT_BODY = json.dumps({"error": "Server busy, try again later"}).encode()
+
+    def __init__(
+        self,
+        server_address: tuple[str, int],
+        handler_class: type[BaseHTTPRequestHandler],
+        workers: int = 8,
+        queue_size: int = 64,
+    ) -> None:
+        """Initialize the server and its worker pool."""
+        super().__init__(server_address, handler_class)
+        self.pool = ThreadPoolExecutor(
+            max_workers=max(1, workers), thread_name_prefix="jac-serve"
+        )
+        self.slots = BoundedSemaphore(max(1, workers) + max(0, queue_size))
+
+    def process_request(
+        self,
+        request: socket.socket | tuple[bytes, socket.socket],
+        client_address: Any,  # noqa: ANN401
+    ) -> None:
+        """Hand the connection to a worker, or reject it if the queue is full."""
+        if not self.slots.acquire(blocking=False):
+            if isinstance(request, socket.socket):
+                with suppress(OSError):
+                    request.sendall(
+                        b"HTTP/1.1 503 Service Unavailable\r\n"
+                        b"Content-Type: application/json\r\n"
+                        + f"Content-Length: {len(self.REJECT_BODY)}\r\n".encode()
+                        + b"Connection: close\r\n\r\n"
+                        + self.REJECT_BODY
+                    )
+            self.shutdown_request(request)
+            return
+        self.pool.submit(self._process_request, request, client_address)
+
+    def _process_request(
+        self,
+        request: socket.socket | tuple[bytes, socket.socket],
+        client_address: Any,  # noqa: ANN401
+    ) -> None:
+        """Serve a connection on a worker thread."""
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self.slots.release()
+
+    def server_close(self) -> None:
+        """Close the socket and stop accepting work on the pool."""
+        super().server_close()
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+
 # Main Server
 class JacAPIServer:
     """REST API Server for Jac programs."""
@@ -789,17 +942,29 @@ class JacAPIServer:
         session_path: str,
         port: int = 8000,
         base_path: str | None = None,
+        workers: int = 8,
+        queue_size: int = 64,
+        connection_timeout: float = 30.0,
+        request_timeout: float | None = None,
+        keepalive_timeout: float = 5.0,
     ) -> None:
         """Initialize the API server."""
         self.module_name = module_name
         self.session_path = session_path
         self.port = port
         self.base_path = base_path
+        self.workers = workers
+        self.queue_size = queue_size
+        self.connection_timeout = connection_timeout
+        self.request_timeout = request_timeout
+        self.keepalive_timeout = keepalive_timeout
 
         # Core components
         self.user_manager = UserManager(session_path)
         self.introspector = Jac.get_module_introspector(module_name, base_path)
-        self.execution_manager = ExecutionManager(session_path, self.user_manager)
+        self.execution_manager = ExecutionManager(
+            session_path, self.user_manager, workers, request_timeout
+        )
 
         # Route handlers
         self.auth_handler = AuthHandler(
@@ -819,6 +984,29 @@ class JacAPIServer:
         class JacRequestHandler(BaseHTTPRequestHandler):
             """Handle HTTP requests."""
 
+            # Connections are kept alive between requests. Clients that stall
+            # while sending a request or reading the response are dropped once
+            # the socket timeout expires, idle ones after the keep-alive timeout.
+            protocol_version = "HTTP/1.1"
+            timeout = server.connection_timeout
+
+            def handle(self) -> None:
+                """Serve the requests of a connection until it is closed or idle."""
+                self.handle_one_request()
+                while not self.close_connection and self._wait_request():
+                    self.handle_one_request()
+
+            def _wait_request(self) -> bool:
+                """Wait for the next request on the connection, False once idle."""
+                self.connection.settimeout(server.keepalive_timeout)
+                try:
+                    return bool(cast(BufferedReader, self.rfile).peek(1))
+                except OSError:
+                    return False
+                finally:
+                    with suppress(OSError):
+                        self.connection.settimeout(self.timeout)
+
             def _get_auth_token(self) -> str | None:
                 """Extract auth token from Authorization header."""
                 auth_header = self.headers.get("Authorization")
@@ -850,6 +1038,7 @@ class JacAPIServer:
             def do_OPTIONS(self) -> None:  # noqa: N802
                 """Handle OPTIONS requests (CORS preflight)."""
                 self.send_response(200)
+                self.send_header("Content-Length", "0")
                 ResponseBuilder._add_cors_headers(self)
                 self.end_headers()
 
@@ -1201,10 +1390,16 @@ class JacAPIServer:
         self.introspector.load()
         handler_class = self.create_handler()
 
-        with HTTPServer(("0.0.0.0", self.port), handler_class) as httpd:
+        with JacHTTPServer(
+            ("0.0.0.0", self.port),
+            handler_class,
+            workers=self.workers,
+            queue_size=self.queue_size,
+        ) as httpd:
             print(f"Jac API Server running on http://0.0.0.0:{self.port}")
             print(f"Module: {self.module_name}")
             print(f"Session: {self.session_path}")
+            print(f"Workers: {self.workers} (queue: {self.queue_size})")
             print("\nAvailable endpoints:")
             print("  POST /user/create - Create a new user")
             print("  POST /user/login - Login and get auth token")
@@ -1220,6 +1415,8 @@ class JacAPIServer:
                 httpd.serve_forever()
             except KeyboardInterrupt:
                 print("\nShutting down server...")
+            finally:
+                self.execution_manager.close()
 
 
 def print_endpoint_docs(server: JacAPIServer) -> None:
@@ -1,10 +1,13 @@
 """Tests for Jac parser."""
 
 import inspect
+from concurrent.futures import ThreadPoolExecutor
+from threading import Barrier
 
 import pluggy
 
 from jaclang.runtimelib.runtime import (
+    JacRuntime,
     JacRuntimeImpl,
     JacRuntimeInterface,
     JacRuntimeSpec,
@@ -69,3 +72,33 @@ class TestFeatures(TestCase):
         # Execute the hook and check both results are returned
         results = pm.hook.setup()
         self.assertIn("I'm here", results)
+
+    def test_context_isolated_per_thread(self) -> None:
+        """Test that each thread sees the execution context it set."""
+        main_ctx = JacRuntime.get_context()
+        barrier = Barrier(4)
+
+        def handle(_: int) -> bool:
+            ctx = JacRuntime.create_j_context()
+            token = JacRuntime.set_context(ctx)
+            barrier.wait()
+            try:
+                return JacRuntime.get_context() is ctx
+            finally:
+                JacRuntime.reset_context(token)
+                ctx.mem.close()
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            self.assertEqual(list(pool.map(handle, range(4))), [True] * 4)
+            # Pooled threads do not keep the context of a finished execution.
+            self.assertEqual(
+                list(pool.map(lambda _: JacRuntime.exec_ctx_var.get(), range(4))),
+                [None] * 4,
+            )
+        self.assertIs(JacRuntime.get_context(), main_ctx)
+
+        # Threads started through `flow` share the caller's context.
+        self.assertIs(
+            JacRuntime.thread_wait(JacRuntime.thread_run(JacRuntime.get_context)),
+            main_ctx,
+        )
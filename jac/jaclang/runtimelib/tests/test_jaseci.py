@@ -3,8 +3,11 @@
 import io
 import os
 import sys
+from unittest.mock import patch
 
 from jaclang.cli import cli
+from jaclang.runtimelib.memory import ShelfStorage
+from jaclang.settings import settings
 from jaclang.utils.test import TestCase
 
 session = ""
@@ -339,6 +342,87 @@ class TestJaseciPlugin(TestCase):
 
         self._del_session(session)
 
+    def test_walker_purger_batched(self) -> None:
+        """Test graph purge committing a few anchors at a time."""
+        session = self.fixture_abs_path("test_walker_purger_batched.session")
+        self._output2buffer()
+        for entrypoint in ("populate", "check"):
+            cli.enter(
+                filename=self.fixture_abs_path("graph_purger.jac"),
+                session=session,
+                entrypoint=entrypoint,
+                args=[],
+            )
+        with patch.object(settings, "purge_batch_size", 7):
+            cli.enter(
+                filename=self.fixture_abs_path("graph_purger.jac"),
+                session=session,
+                entrypoint="purge",
+                args=[],
+            )
+        for entrypoint in ("traverse", "check"):
+            cli.enter(
+                filename=self.fixture_abs_path("graph_purger.jac"),
+                session=session,
+                entrypoint=entrypoint,
+                args=[],
+            )
+        output = self.capturedOutput.getvalue().strip()
+        self.assertEqual(output, "125\n124\nRoot()\n1")
+        self._del_session(session)
+
+    def test_walker_purger_bounded_cache(self) -> None:
+        """Test graph walks and purge with only a few anchors kept loaded."""
+        session = self.fixture_abs_path("test_walker_purger_bounded_cache.session")
+        self._output2buffer()
+        with patch.object(settings, "anchor_cache_size", 5):
+            for entrypoint in ("populate", "check", "purge", "traverse", "check"):
+                cli.enter(
+                    filename=self.fixture_abs_path("graph_purger.jac"),
+                    session=session,
+                    entrypoint=entrypoint,
+                    args=[],
+                )
+        output = self.capturedOutput.getvalue().strip()
+        self.assertEqual(output, "125\n124\nRoot()\n1")
+        self._del_session(session)
+
+    def test_walker_prefetches_neighbours(self) -> None:
+        """Test traversal loads the neighbours of a hop in one batch."""
+        session = self.fixture_abs_path("test_walker_prefetches_neighbours.session")
+        self._output2buffer()
+        cli.enter(
+            filename=self.fixture_abs_path("graph_purger.jac"),
+            session=session,
+            entrypoint="populate",
+            args=[],
+        )
+        with (
+            patch.object(settings, "anchor_cache_size", 0),
+            patch.object(
+                ShelfStorage, "find", autospec=True, side_effect=ShelfStorage.find
+            ) as find,
+            patch.object(
+                ShelfStorage,
+                "find_by_id",
+                autospec=True,
+                side_effect=ShelfStorage.find_by_id,
+            ) as find_by_id,
+        ):
+            cli.enter(
+                filename=self.fixture_abs_path("graph_purger.jac"),
+                session=session,
+                entrypoint="traverse",
+                args=[],
+            )
+        output = self.capturedOutput.getvalue().strip()
+        self.assertEqual(len(output.splitlines()), 63)
+        # At most the edges of a node, then their nodes, per hop.
+        self.assertLessEqual(find.call_count, 2 * 63)
+        # Only the entry root is still loaded on its own.
+        self.assertLessEqual(find_by_id.call_count, 1)
+        self._del_session(session)
+
     def trigger_access_validation_test(
         self, give_access_to_full_graph: bool, via_all: bool = False
     ) -> None:
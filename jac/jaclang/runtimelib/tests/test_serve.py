@@ -6,12 +6,19 @@ import os
 import socket
 import threading
 import time
+from http.client import HTTPConnection
+from http.server import BaseHTTPRequestHandler
 from urllib.error import HTTPError
 from urllib.request import Request, urlopen
 
 from jaclang.cli import cli
 from jaclang.runtimelib.runtime import JacRuntime as Jac
-from jaclang.runtimelib.server import JacAPIServer, UserManager
+from jaclang.runtimelib.server import (
+    ExecutionManager,
+    JacAPIServer,
+    JacHTTPServer,
+    UserManager,
+)
 from jaclang.utils.test import TestCase
 
 
@@ -224,6 +231,115 @@ class TestServeCommand(TestCase):
         username = user_mgr.validate_token("invalid_token")
         self.assertIsNone(username)
 
+    def test_session_pool_reuses_context(self) -> None:
+        """Test requests share the session anchor cache with their own buffers."""
+        user_mgr = UserManager(self.session_file)
+        exec_mgr = ExecutionManager(self.session_file, user_mgr)
+        user1 = user_mgr.create_user("user1", "pass1")
+        user2 = user_mgr.create_user("user2", "pass2")
+
+        def whoami() -> tuple[str, int, int]:
+            ctx = Jac.get_context()
+            root = ctx.get_root().__jac__
+            return root.id.hex, id(root), len(ctx.mem.get_mem())
+
+        root1, anchor1, buffered1 = exec_mgr.execute_function(whoami, {}, "user1")[
+            "result"
+        ]
+        root2, _, buffered2 = exec_mgr.execute_function(whoami, {}, "user2")["result"]
+        again1, anchor1_again, _ = exec_mgr.execute_function(whoami, {}, "user1")[
+            "result"
+        ]
+        self.assertEqual(root1, user1["root_id"])
+        self.assertEqual(root2, user2["root_id"])
+        # The root loaded by the first request is reused by the next one.
+        self.assertEqual((again1, anchor1_again), (root1, anchor1))
+        # Only the system root and the user's root are buffered per request.
+        self.assertEqual((buffered1, buffered2), (2, 2))
+        pool = user_mgr.sessions
+        assert pool._ctx is not None
+        self.assertEqual(pool._ctx.mem.__pins__, {})
+        self.assertEqual(len(pool._roots), 0)
+
+        # Committed data survives closing the pool and reopening the session.
+        user_mgr.close()
+        exec_mgr = ExecutionManager(self.session_file, UserManager(self.session_file))
+        root1, _, _ = exec_mgr.execute_function(whoami, {}, "user1")["result"]
+        self.assertEqual(root1, user1["root_id"])
+        exec_mgr.user_manager.close()
+
+    def test_session_pool_runs_roots_concurrently(self) -> None:
+        """Test a busy root does not hold up requests on other roots."""
+        user_mgr = UserManager(self.session_file)
+        root1 = user_mgr.create_user("user1", "pass1")["root_id"]
+        root2 = user_mgr.create_user("user2", "pass2")["root_id"]
+        entered, release = threading.Event(), threading.Event()
+
+        def hold() -> None:
+            with user_mgr.sessions.request(root1):
+                entered.set()
+                release.wait(5)
+
+        holder = threading.Thread(target=hold)
+        holder.start()
+        self.assertTrue(entered.wait(5))
+        try:
+            with user_mgr.sessions.request(root2) as ctx:
+                self.assertEqual(ctx.get_root().__jac__.id.hex, root2)
+        finally:
+            release.set()
+            holder.join(5)
+        user_mgr.close()
+
+    def test_request_timeout(self) -> None:
+        """Test requests running past the timeout get a 504."""
+        self._start_server()
+        create = self._request(
+            "POST", "/user/create", {"username": "slow", "password": "pass"}
+        )
+        self.server.execution_manager.timeout = 0.2
+
+        # The root is busy, so the function cannot finish before the timeout.
+        with self.server.user_manager.sessions.request(create["root_id"]):
+            status, payload, _ = self._request_raw(
+                "POST",
+                "/function/add_numbers",
+                {"args": {"a": 1, "b": 2}},
+                token=create["token"],
+            )
+        self.assertEqual(status, 504)
+        self.assertIn("error", json.loads(payload))
+
+        result = self._request(
+            "POST",
+            "/function/add_numbers",
+            {"args": {"a": 1, "b": 2}},
+            token=create["token"],
+        )
+        self.assertEqual(result["result"], 3)
+
+    def test_keep_alive(self) -> None:
+        """Test connections are reused between requests until idle."""
+        self._start_server()
+        self.server.keepalive_timeout = 0.2
+        conn = HTTPConnection("127.0.0.1", self.port, timeout=5)
+        self.addCleanup(conn.close)
+
+        sockets = []
+        for path in ("/", "/functions"):
+            conn.request("GET", path)
+            response = conn.getresponse()
+            self.assertEqual(response.status, 200)
+            response.read()
+            sockets.append(conn.sock)
+        sock = sockets[0]
+        self.assertIs(sockets[1], sock)
+
+        # The server drops the connection once it has been idle.
+        time.sleep(0.5)
+        assert sock is not None
+        self.assertEqual(sock.recv(1), b"")
+
     def test_server_user_creation(self) -> None:
         """Test user creation endpoint."""
         self._start_server()
@@ -1319,3 +1435,67 @@ class TestAccessLevelAuthentication(TestCase):
             token=token,
         )
         self.assertIn("result", result4)
+
+
+class TestJacHTTPServer(TestCase):
+    """Test the concurrent HTTP server used by jac serve."""
+
+    def _serve(self, workers: int, queue_size: int, release: threading.Event) -> int:
+        """Start a server whose /slow route blocks until release is set."""
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:  # noqa: N802
+                if self.path == "/slow":
+                    release.wait(10)
+                Jac.send_json(self, 200, {"path": self.path})
+
+            def log_message(self, *args: object) -> None:
+                pass
+
+        try:
+            httpd = JacHTTPServer(
+                ("127.0.0.1", 0), Handler, workers=workers, queue_size=queue_size
+            )
+        except PermissionError:
+            self.skipTest("Socket operations are not permitted in this environment")
+        threading.Thread(target=httpd.serve_forever, daemon=True).start()
+        self.addCleanup(httpd.server_close)
+        self.addCleanup(httpd.shutdown)
+        self.addCleanup(release.set)
+        return httpd.server_address[1]
+
+    def _get(self, port: int, path: str) -> tuple[int, dict]:
+        try:
+            with urlopen(f"http://127.0.0.1:{port}{path}", timeout=5) as response:
+                return response.status, json.loads(response.read())
+        except HTTPError as e:
+            return e.code, json.loads(e.read())
+
+    def test_slow_request_does_not_block_others(self) -> None:
+        """Test that a blocked request leaves other workers free."""
+        release = threading.Event()
+        port = self._serve(workers=2, queue_size=0, release=release)
+        slow = threading.Thread(target=self._get, args=(port, "/slow"))
+        slow.start()
+        time.sleep(0.2)
+
+        self.assertEqual(self._get(port, "/fast"), (200, {"path": "/fast"}))
+        release.set()
+        slow.join(5)
+
+    def test_rejects_when_queue_full(self) -> None:
+        """Test that connections beyond workers + queue get a 503."""
+        release = threading.Event()
+        port = self._serve(workers=1, queue_size=0, release=release)
+        slow = threading.Thread(target=self._get, args=(port, "/slow"))
+        slow.start()
+        time.sleep(0.2)
+
+        status, body = self._get(port, "/fast")
+        self.assertEqual(status, 503)
+        self.assertIn("error", body)
+        release.set()
+        slow.join(5)
+        self.assertEqual(self._get(port, "/fast"), (200, {"path": "/fast"}))
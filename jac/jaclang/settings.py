@@ -21,6 +21,13 @@ class Settings:
     ignore_test_annex: bool = False
     pyfile_raise: bool = False
     pyfile_raise_full: bool = False
+    bytecode_cache: bool = False
+    stub_cache: bool = True
+
+    # Persistence configuration
+    anchor_codec: str = "pickle"
+    purge_batch_size: int = 500
+    anchor_cache_size: int = 0
 
     # Formatter configuration
     max_line_length: int = 88
@@ -30,6 +37,7 @@ class Settings:
 
     # LSP configuration
     lsp_debug: bool = False
+    lsp_change_delay_ms: int = 300
 
     def __post_init__(self) -> None:
         """Initialize settings."""
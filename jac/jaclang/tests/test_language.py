@@ -2,6 +2,8 @@
 
 import io
 import os
+import pickle
+import shelve
 import subprocess
 import sys
 import tempfile
@@ -13,6 +15,16 @@ import pytest
 from jaclang import JacRuntime as Jac
 from jaclang.cli import cli
 from jaclang.compiler.program import JacProgram
+from jaclang.runtimelib.archetype import (
+    ANCHOR_PARTS,
+    NodeAnchor,
+    NodeArchetype,
+    Root,
+    WalkerArchetype,
+)
+from jaclang.runtimelib.codec import MAGIC, ArchetypeLayout, CompactAnchorCodec
+from jaclang.runtimelib.memory import Memory, ShelfStorage
+from jaclang.runtimelib.runtime import WalkerDispatch
 from jaclang.runtimelib.utils import read_file_with_encoding
 from jaclang.utils.test import TestCase
 
@@ -99,6 +111,233 @@ class JacLanguageTests(TestCase):
             "Visited 1\nVisited 2\n",
         )
 
+    def test_typed_edge_index(self) -> None:
+        """Test typed edge traversals served from the adjacency index."""
+        captured_output = io.StringIO()
+        sys.stdout = captured_output
+        cli.run(self.fixture_abs_path("typed_edge_index.jac"))
+        sys.stdout = sys.__stdout__
+        self.assertEqual(
+            captured_output.getvalue().split("\n")[:-1],
+            [
+                "[Item(val=2), Item(val=3)]",
+                "[Item(val=3)]",
+                "[Item(val=2), Item(val=3)]",
+                "[Item(val=3)]",
+                "[Follows(weight=1), Likes(weight=5)]",
+                "[Item(val=1)]",
+                "[Item(val=2), Item(val=3), Item(val=1)]",
+                "[Item(val=3), Other()]",
+                "[Item(val=2)]",
+                "[Item(val=2), Item(val=1), Root()]",
+            ],
+        )
+
+    def test_walker_dispatch_plan_cache(self) -> None:
+        """Test walker ability dispatch plans are cached and invalidated."""
+        captured_output = io.StringIO()
+        sys.stdout = captured_output
+        (mod,) = Jac.jac_import(
+            "micro.simple_walk_by_edge", base_path=self.examples_abs_path("")
+        )
+        sys.stdout = sys.__stdout__
+        self.assertEqual(captured_output.getvalue(), "Visited 1\nVisited 2\n")
+
+        walk, node = mod.Walk, mod.A
+        plans = WalkerDispatch.plans[walk]
+        plan = plans[node]
+        self.assertEqual([f.__name__ for f in plan.walker_entry], ["step"])
+        self.assertEqual(plan.loc, [])
+        self.assertEqual(plans[type(None)].walker_entry, [])
+
+        Jac.make_archetype(node)
+        self.assertNotIn(node, plans)
+        self.assertIn(type(None), plans)
+
+        # Plans of subclasses are dropped along with their base.
+        WalkerDispatch.get(walk(), node())
+        WalkerDispatch.invalidate(NodeArchetype)
+        self.assertNotIn(node, plans)
+        self.assertIn(type(None), plans)
+        WalkerDispatch.invalidate(WalkerArchetype)
+        self.assertNotIn(walk, WalkerDispatch.plans)
+
+    def test_anchor_dirty_tracking(self) -> None:
+        """Test anchors track which parts changed since last commit."""
+        (mod,) = Jac.jac_import(
+            "anchor_dirty_tracking", base_path=self.fixture_abs_path("./")
+        )
+        item, other = mod.Item(val=1), mod.Item()
+        self.assertEqual(item.__jac__.changes(), set(ANCHOR_PARTS))
+
+        # The plain list of a new anchor may be shared, so it is always written.
+        item.__jac__.mark_clean()
+        self.assertEqual(item.__jac__.changes(), {"archetype"})
+
+        # Loaded anchors track their containers without serializing.
+        anchor = pickle.loads(pickle.dumps(item.__jac__))
+        item = anchor.archetype
+        self.assertEqual(anchor.changes(), set())
+        item.val = 2
+        self.assertEqual(anchor.changes(), {"archetype"})
+
+        anchor.mark_clean()
+        Jac.perm_grant(item, "READ")
+        self.assertEqual(anchor.changes(), {"access"})
+
+        anchor.mark_clean()
+        Jac.build_edge(False, None, None)(anchor, other.__jac__)
+        self.assertEqual(anchor.changes(), {"edges"})
+
+        anchor.mark_clean()
+        item.tags.append("x")
+        self.assertEqual(anchor.changes(), {"archetype"})
+        self.assertIs(type(pickle.loads(pickle.dumps(item.tags))), list)
+
+        # Containers the anchor does not own cannot be watched.
+        anchor.mark_clean()
+        item.tags = ["y"]
+        anchor.mark_clean()
+        self.assertEqual(anchor.changes(), {"archetype"})
+
+    def test_compact_anchor_codec(self) -> None:
+        """Test anchors round trip through the compact codec and shelf storage."""
+        (mod,) = Jac.jac_import(
+            "anchor_dirty_tracking", base_path=self.fixture_abs_path("./")
+        )
+        item, other = mod.Item(val=-3, tags=["a", "b"]), mod.Item()
+        Jac.build_edge(False, None, None)(item.__jac__, other.__jac__)
+        Jac.perm_grant(item, "READ")
+
+        codec = CompactAnchorCodec()
+        data = codec.dumps(item.__jac__)
+        self.assertTrue(data.startswith(MAGIC))
+        self.assertLess(len(data), len(pickle.dumps(item.__jac__)))
+
+        anchor = codec.loads(data)
+        self.assertIsInstance(anchor, NodeAnchor)
+        self.assertEqual(anchor.id, item.__jac__.id)
+        self.assertEqual(anchor.access, item.__jac__.access)
+        self.assertEqual([e.id for e in anchor.edges], [item.__jac__.edges[0].id])
+        self.assertEqual(
+            (anchor.archetype.val, anchor.archetype.tags), (-3, ["a", "b"])
+        )
+        self.assertIs(anchor.archetype.__jac__, anchor)
+        self.assertEqual(anchor.changes(), set())
+
+        edge = codec.loads(codec.dumps(item.__jac__.edges[0]))
+        self.assertEqual(edge.source.id, item.__jac__.id)
+        self.assertEqual(edge.target.id, other.__jac__.id)
+
+        # Pickled records stay readable whichever codec a backend uses.
+        self.assertEqual(codec.loads(pickle.dumps(other.__jac__)).id, other.__jac__.id)
+
+        # Classes are stored by module and qualname, not by bare class name.
+        name = ArchetypeLayout.name_of(mod.Item)
+        self.assertEqual(name, f"{mod.__name__}:Item")
+        ArchetypeLayout.classes.clear()
+        self.assertIs(ArchetypeLayout.resolve(name), mod.Item)
+        with self.assertRaises(ValueError):
+            ArchetypeLayout.resolve(f"{mod.__name__}:Missing")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            session = os.path.join(tmp, "session")
+            mem = ShelfStorage(session, codec=codec)
+            for anc in (item.__jac__, other.__jac__, item.__jac__.edges[0]):
+                anc.persistent = True
+                mem.set(anc)
+            mem.close()
+
+            mem = ShelfStorage(session)
+            loaded = mem.find_by_id(item.__jac__.id)
+            self.assertIsNotNone(loaded)
+            self.assertEqual(loaded.archetype.tags, ["a", "b"])
+            self.assertEqual(len(list(mem.query())), 3)
+            mem.close()
+
+    def test_type_index(self) -> None:
+        """Test shelf storage finds anchors by archetype without a full scan."""
+        (mod,) = Jac.jac_import(
+            "anchor_dirty_tracking", base_path=self.fixture_abs_path("./")
+        )
+        root, item, other = Root(), mod.Item(val=1), mod.Item(val=2)
+        Jac.build_edge(False, None, None)(item.__jac__, other.__jac__)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            session = os.path.join(tmp, "session")
+            mem = ShelfStorage(session)
+            anchors = (root.__jac__, item.__jac__, other.__jac__, item.__jac__.edges[0])
+            for anc in anchors:
+                anc.persistent = True
+                mem.set(anc)
+            mem.close()
+
+            mem = ShelfStorage(session)
+            self.assertEqual([r.__jac__.id for r in mem.all_root()], [root.__jac__.id])
+            self.assertEqual(list(mem.__mem__), [root.__jac__.id])
+            self.assertEqual(
+                {a.id for a in mem.find_by_type(mod.Item)},
+                {item.__jac__.id, other.__jac__.id},
+            )
+            self.assertEqual(
+                [
+                    a.archetype.val
+                    for a in mem.find_by_type(mod.Item, lambda a: a.archetype.val > 1)
+                ],
+                [2],
+            )
+            self.assertEqual(len(mem.__mem__), 3)
+
+            # Updates keep their index keys, one set of ids per class and root.
+            loaded = mem.find_by_id(item.__jac__.id)
+            loaded.archetype.val = 5
+            mem.sync_mem_to_db([loaded.id])
+            self.assertEqual((mem.__indexed__, mem.__unindexed__), ({}, {}))
+            self.assertEqual(
+                mem.__index__[f"type:{mod.__name__}:Item"],
+                {str(item.__jac__.id), str(other.__jac__.id)},
+            )
+
+            # Removed anchors leave the index once committed.
+            mem.remove(other.__jac__.id)
+            mem.close()
+            mem = ShelfStorage(session)
+            self.assertEqual(
+                [a.id for a in mem.find_by_type(mod.Item)], [item.__jac__.id]
+            )
+            self.assertEqual(
+                mem.__index__[f"type:{mod.__name__}:Item"], {str(item.__jac__.id)}
+            )
+            mem.close()
+
+            # Shelves written without an index are indexed on first use.
+            with shelve.open(f"{session}.index") as index:
+                index.clear()
+            mem = ShelfStorage(session)
+            self.assertEqual([r.__jac__.id for r in mem.all_root()], [root.__jac__.id])
+            mem.close()
+
+    def test_pinned_anchors_stay_loaded(self) -> None:
+        """Test a bounded memory only evicts anchors that are not pinned."""
+        (mod,) = Jac.jac_import(
+            "anchor_dirty_tracking", base_path=self.fixture_abs_path("./")
+        )
+        item, other = mod.Item(val=1), mod.Item(val=2)
+        Jac.build_edge(False, None, None)(item.__jac__, other.__jac__)
+        anchors = (item.__jac__, other.__jac__, item.__jac__.edges[0])
+        for anc in anchors:
+            anc.persistent = True
+
+        mem = Memory(cache_size=1, write_back=lambda a: [x.mark_clean() for x in a])
+        with mem.pinning(item.__jac__):
+            mem.set(item.__jac__)
+            mem.set(other.__jac__)
+            self.assertTrue(item.__jac__.is_populated())
+        mem.set(anchors[2])
+        self.assertFalse(item.__jac__.is_populated())
+        self.assertFalse(other.__jac__.is_populated())
+        self.assertEqual(mem.__pins__, {})
+
     def test_guess_game(self) -> None:
         """Parse micro jac file."""
         captured_output = io.StringIO()